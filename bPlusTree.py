@@ -0,0 +1,338 @@
+from bisect import bisect_left, bisect_right
+from collections import deque
+from graphviz import Digraph
+
+
+class LeafNode:
+    __slots__ = ('keys', 'next')
+
+    def __init__(self, keys=None):
+        self.keys = keys if keys is not None else []
+        self.next = None
+
+
+class InternalNode:
+    # children[i] holds keys < keys[i]; children[i + 1] holds keys >= keys[i]
+    __slots__ = ('keys', 'children')
+
+    def __init__(self, keys=None, children=None):
+        self.keys = keys if keys is not None else []
+        self.children = children if children is not None else []
+
+
+class BPlusTree:
+    """
+    In-memory B+-tree with configurable fanout.
+
+    Every node keeps its keys in one sorted Python list, so a lookup binary-searches
+    a contiguous block per level and the tree is about log2(order) times shallower
+    than a binary tree. All keys live in the leaves, which are linked left to
+    right, so in-order iteration and range scans walk consecutive leaves.
+    """
+
+    def __init__(self, order=64):
+        """
+        Args:
+            order (int): Maximum number of children per internal node (and keys per leaf); at least 3.
+        """
+        if order < 3:
+            raise ValueError("order must be at least 3")
+        self.order = order
+        self.max_keys = order - 1
+        self.min_keys = (order - 1) // 2
+        self.root = LeafNode()
+        self.count = 0
+
+    @classmethod
+    def from_sorted(cls, keys, order=64):
+        """
+        Bulk-load sorted keys bottom-up in O(n), filling every node completely.
+
+        Args:
+            keys (iterable): Keys in ascending order; adjacent duplicates are dropped.
+            order (int): Fanout of the new tree.
+
+        Returns:
+            BPlusTree: New tree containing the keys.
+        """
+        tree = cls(order)
+        unique = []
+        for key in keys:
+            if not unique or key != unique[-1]:
+                unique.append(key)
+        if not unique:
+            return tree
+        step = tree.max_keys
+        leaves = [LeafNode(unique[i:i + step]) for i in range(0, len(unique), step)]
+        tree._fix_last(leaves, tree.min_keys)
+        for left, right in zip(leaves, leaves[1:]):
+            left.next = right
+        level = leaves
+        while len(level) > 1:
+            parents = []
+            for i in range(0, len(level), tree.order):
+                children = level[i:i + tree.order]
+                parents.append(InternalNode([_first_key(child) for child in children[1:]], children))
+            tree._fix_last(parents, tree.min_keys)
+            level = parents
+        tree.root = level[0]
+        tree.count = len(unique)
+        return tree
+
+    def _fix_last(self, nodes, minimum):
+        # the last chunk may be underfull: even it out with its left neighbour
+        if len(nodes) < 2:
+            return
+        left, last = nodes[-2], nodes[-1]
+        if isinstance(last, LeafNode):
+            if len(last.keys) >= minimum:
+                return
+            keys = left.keys + last.keys
+            half = len(keys) // 2
+            left.keys, last.keys = keys[:half], keys[half:]
+        else:
+            if len(last.children) > minimum:
+                return
+            children = left.children + last.children
+            half = len(children) // 2
+            left.children, last.children = children[:half], children[half:]
+            left.keys = [_first_key(child) for child in left.children[1:]]
+            last.keys = [_first_key(child) for child in last.children[1:]]
+
+    @classmethod
+    def from_iterable(cls, keys, order=64):
+        return cls.from_sorted(sorted(set(keys)), order)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key):
+        return self.search(key) is not None
+
+    def _find_leaf(self, key):
+        node = self.root
+        while isinstance(node, InternalNode):
+            node = node.children[bisect_right(node.keys, key)]
+        return node
+
+    def search(self, key):
+        """
+        Look a key up.
+
+        Returns:
+            LeafNode: Leaf holding the key, or None if it is not in the tree.
+        """
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        if i < len(leaf.keys) and leaf.keys[i] == key:
+            return leaf
+        return None
+
+    def findMin(self):
+        node = self.root
+        while isinstance(node, InternalNode):
+            node = node.children[0]
+        return node.keys[0] if node.keys else None
+
+    def height(self):
+        levels = 1
+        node = self.root
+        while isinstance(node, InternalNode):
+            node = node.children[0]
+            levels += 1
+        return levels
+
+    # ------------------ INSERT ------------------
+    def insert(self, key):
+        split = self._insert(self.root, key)
+        if split is not None:
+            separator, right = split
+            self.root = InternalNode([separator], [self.root, right])
+
+    def _insert(self, node, key):
+        """Insert below node; returns (separator, new right sibling) if node had to split."""
+        if isinstance(node, LeafNode):
+            keys = node.keys
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                return None
+            keys.insert(i, key)
+            self.count += 1
+            if len(keys) <= self.max_keys:
+                return None
+            half = len(keys) // 2
+            right = LeafNode(keys[half:])
+            del keys[half:]
+            right.next = node.next
+            node.next = right
+            return right.keys[0], right
+
+        i = bisect_right(node.keys, key)
+        split = self._insert(node.children[i], key)
+        if split is None:
+            return None
+        separator, child = split
+        node.keys.insert(i, separator)
+        node.children.insert(i + 1, child)
+        if len(node.children) <= self.order:
+            return None
+        half = len(node.children) // 2
+        promoted = node.keys[half - 1]
+        right = InternalNode(node.keys[half:], node.children[half:])
+        del node.keys[half - 1:]
+        del node.children[half:]
+        return promoted, right
+
+    # ------------------ REMOVE ------------------
+    def remove(self, key):
+        self._remove(self.root, key)
+        root = self.root
+        if isinstance(root, InternalNode) and len(root.children) == 1:
+            self.root = root.children[0]
+
+    def _remove(self, node, key):
+        if isinstance(node, LeafNode):
+            i = bisect_left(node.keys, key)
+            if i < len(node.keys) and node.keys[i] == key:
+                del node.keys[i]
+                self.count -= 1
+            return
+        i = bisect_right(node.keys, key)
+        child = node.children[i]
+        self._remove(child, key)
+        if isinstance(child, LeafNode):
+            if len(child.keys) < self.min_keys:
+                self._fix_leaf(node, i)
+        elif len(child.children) < self.min_keys + 1:
+            self._fix_internal(node, i)
+
+    def _fix_leaf(self, parent, i):
+        child = parent.children[i]
+        left = parent.children[i - 1] if i > 0 else None
+        right = parent.children[i + 1] if i + 1 < len(parent.children) else None
+        if left is not None and len(left.keys) > self.min_keys:
+            child.keys.insert(0, left.keys.pop())
+            parent.keys[i - 1] = child.keys[0]
+        elif right is not None and len(right.keys) > self.min_keys:
+            child.keys.append(right.keys.pop(0))
+            parent.keys[i] = right.keys[0]
+        elif left is not None:
+            left.keys.extend(child.keys)
+            left.next = child.next
+            del parent.keys[i - 1]
+            del parent.children[i]
+        elif right is not None:
+            child.keys.extend(right.keys)
+            child.next = right.next
+            del parent.keys[i]
+            del parent.children[i + 1]
+
+    def _fix_internal(self, parent, i):
+        child = parent.children[i]
+        left = parent.children[i - 1] if i > 0 else None
+        right = parent.children[i + 1] if i + 1 < len(parent.children) else None
+        if left is not None and len(left.children) > self.min_keys + 1:
+            # rotate through the parent separator
+            child.keys.insert(0, parent.keys[i - 1])
+            child.children.insert(0, left.children.pop())
+            parent.keys[i - 1] = left.keys.pop()
+        elif right is not None and len(right.children) > self.min_keys + 1:
+            child.keys.append(parent.keys[i])
+            child.children.append(right.children.pop(0))
+            parent.keys[i] = right.keys.pop(0)
+        elif left is not None:
+            left.keys.append(parent.keys.pop(i - 1))
+            left.keys.extend(child.keys)
+            left.children.extend(child.children)
+            del parent.children[i]
+        elif right is not None:
+            child.keys.append(parent.keys.pop(i))
+            child.keys.extend(right.keys)
+            child.children.extend(right.children)
+            del parent.children[i + 1]
+
+    # ------------------ SCANS ------------------
+    def __iter__(self):
+        return self.iter_inorder()
+
+    def iter_inorder(self, start=None):
+        """
+        Yield keys in sorted order by walking the leaf chain.
+
+        Args:
+            start (optional): Begin at the first key >= start.
+        """
+        if start is None:
+            leaf = self.root
+            while isinstance(leaf, InternalNode):
+                leaf = leaf.children[0]
+            i = 0
+        else:
+            leaf = self._find_leaf(start)
+            i = bisect_left(leaf.keys, start)
+        while leaf is not None:
+            keys = leaf.keys
+            while i < len(keys):
+                yield keys[i]
+                i += 1
+            leaf = leaf.next
+            i = 0
+
+    def range(self, lo, hi):
+        """Yield the keys in [lo, hi] in ascending order."""
+        for key in self.iter_inorder(lo):
+            if key > hi:
+                return
+            yield key
+
+    def inorder(self):
+        return list(self.iter_inorder())
+
+    def level_order(self):
+        """
+        Return the key lists of all nodes, level by level.
+
+        Returns:
+            list: One list per level, each holding one key list per node.
+        """
+        levels = []
+        level = [self.root]
+        while level:
+            levels.append([list(node.keys) for node in level])
+            if isinstance(level[0], LeafNode):
+                break
+            level = [child for node in level for child in node.children]
+        return levels
+
+    def draw(self, filename='bplus_tree', view=True):
+        """
+        Generate a visual PNG of the tree using Graphviz.
+
+        Args:
+            filename (str): Name of the output file (default is 'bplus_tree').
+            view (bool): Open the rendered image in the system viewer.
+        """
+        dot = self.build_digraph()
+        dot.render(filename, view=view, format='png')
+        print(f"\nTree rendered and saved as '{filename}.png'")
+
+    def build_digraph(self):
+        dot = Digraph()
+        dot.attr('node', shape='record')
+        queue = deque([self.root])
+        while queue:
+            node = queue.popleft()
+            dot.node(str(id(node)), ' | '.join(str(key) for key in node.keys) or ' ')
+            if isinstance(node, InternalNode):
+                for child in node.children:
+                    dot.edge(str(id(node)), str(id(child)))
+                    queue.append(child)
+            elif node.next is not None:
+                dot.edge(str(id(node)), str(id(node.next)), style='dashed', constraint='false')
+        return dot
+
+
+def _first_key(node):
+    while isinstance(node, InternalNode):
+        node = node.children[0]
+    return node.keys[0]
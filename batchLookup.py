@@ -0,0 +1,94 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to a merged walk
+    np = None
+
+
+def sorted_snapshot(keys):
+    """
+    Materialize sorted keys for batch lookups.
+
+    Args:
+        keys (iterable): Keys in ascending order, e.g. tree.iter_inorder().
+
+    Returns:
+        numpy.ndarray | list: An int64 array when NumPy is installed and the keys
+        fit, otherwise a list.
+    """
+    keys = list(keys)
+    if np is not None:
+        try:
+            return np.array(keys, dtype=np.int64)
+        except (OverflowError, TypeError, ValueError):
+            pass
+    return keys
+
+
+def contains_many(snapshot, queries):
+    """
+    Membership test for a whole batch of keys against a sorted snapshot.
+
+    Uses numpy.searchsorted when the snapshot is a NumPy array; otherwise the
+    queries are sorted once and merged against the snapshot in a single pass.
+
+    Args:
+        snapshot (numpy.ndarray | list): Result of sorted_snapshot().
+        queries (iterable | numpy.ndarray): Keys to look up.
+
+    Returns:
+        numpy.ndarray | list: Boolean mask aligned with queries.
+    """
+    if np is not None and isinstance(snapshot, np.ndarray):
+        queries = np.asarray(queries)
+        if not _fits_int64(queries):
+            # casting would truncate 3.5 to 3 or overflow on 2**70; compare the original values
+            return np.array(_merged_walk(snapshot.tolist(), queries.tolist()), dtype=bool)
+        if not len(snapshot):
+            return np.zeros(len(queries), dtype=bool)
+        idx = np.searchsorted(snapshot, queries)
+        np.minimum(idx, len(snapshot) - 1, out=idx)
+        return snapshot[idx] == queries
+    return _merged_walk(snapshot, list(queries))
+
+
+def search_many(snapshot, queries):
+    """
+    Return the queried keys that are present, in query order.
+
+    Args:
+        snapshot (numpy.ndarray | list): Result of sorted_snapshot().
+        queries (iterable | numpy.ndarray): Keys to look up.
+
+    Returns:
+        numpy.ndarray | list: The found keys.
+    """
+    if np is not None and isinstance(snapshot, np.ndarray):
+        queries = np.asarray(queries)
+        return queries[contains_many(snapshot, queries)]
+    queries = list(queries)
+    mask = _merged_walk(snapshot, queries)
+    return [key for key, found in zip(queries, mask) if found]
+
+
+def _fits_int64(queries):
+    kind = queries.dtype.kind
+    if kind == 'i':
+        return True
+    if kind == 'u':
+        return not queries.size or int(queries.max()) <= np.iinfo(np.int64).max
+    return False
+
+
+def _merged_walk(snapshot, queries):
+    order = sorted(range(len(queries)), key=queries.__getitem__)
+    mask = [False] * len(queries)
+    i = 0
+    n = len(snapshot)
+    for q in order:
+        key = queries[q]
+        while i < n and snapshot[i] < key:
+            i += 1
+        if i == n:
+            break
+        mask[q] = snapshot[i] == key
+    return mask
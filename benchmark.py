@@ -0,0 +1,396 @@
+"""
+Benchmark harness for VisualBST (binarySearchTree8.py), BalancedBST (binarySearchTree9.py),
+RedBlackBST (redBlackTree.py) and BPlusTree (bPlusTree.py).
+
+Runs insert, search, remove and traversal phases for several key workloads and
+tree sizes and prints the results as JSON: ops/sec, p50/p99 latency per
+operation, final tree height and peak traced memory.
+
+Usage:
+    python3 benchmark.py --sizes 1e3,1e4,1e5 --output results.json
+    python3 benchmark.py --save-baseline bench_baseline.json
+    python3 benchmark.py --compare bench_baseline.json --tolerance 0.2
+
+With --compare the run exits with status 1 if any phase lost more than
+`tolerance` of its baseline throughput, or if no phase of the run has a
+baseline row to compare with. Phases without a baseline row are listed under
+"unmatched".
+The committed bench_baseline.json is a --sizes 1e3 run; throughput is
+machine-specific, so re-record it locally before comparing (see README).
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from itertools import accumulate
+
+from binarySearchTree8 import VisualBST
+from bPlusTree import BPlusTree
+from binarySearchTree9 import BalancedBST
+from redBlackTree import RedBlackBST
+
+WORKLOADS = ('random', 'sorted', 'reverse', 'zipf', 'mixed')
+DEGENERATE = ('sorted', 'reverse')
+
+
+class VisualAdapter:
+    """Give VisualBST the same call shape as BalancedBST."""
+    name = 'VisualBST'
+
+    def __init__(self):
+        self.tree = VisualBST()
+
+    def insert(self, key):
+        self.tree.root = self.tree.insert(self.tree.root, key)
+
+    def search(self, key):
+        return self.tree.searchBST(self.tree.root, key)
+
+    def remove(self, key):
+        self.tree.root, _ = self.tree.remove(self.tree.root, key)
+
+    def traverse(self):
+        count = 0
+        for _ in self.tree.iter_inorder():
+            count += 1
+        return count
+
+    def height(self):
+        return tree_height(self.tree.root)
+
+
+class BalancedAdapter:
+    name = 'BalancedBST'
+    tree_cls = BalancedBST
+
+    def __init__(self):
+        self.tree = self.tree_cls()
+        self.insert = self.tree.insert
+        self.search = self.tree.search
+        self.remove = self.tree.remove
+
+    def traverse(self):
+        count = 0
+        for _ in self.tree.iter_inorder():
+            count += 1
+        return count
+
+    def height(self):
+        return tree_height(self.tree.root)
+
+
+class RedBlackAdapter(BalancedAdapter):
+    name = 'RedBlackBST'
+    tree_cls = RedBlackBST
+
+
+class BPlusAdapter(BalancedAdapter):
+    name = 'BPlusTree'
+    tree_cls = BPlusTree
+
+    def height(self):
+        return self.tree.height()
+
+
+ENGINES = {
+    'VisualBST': VisualAdapter,
+    'BalancedBST': BalancedAdapter,
+    'RedBlackBST': RedBlackAdapter,
+    'BPlusTree': BPlusAdapter,
+}
+
+
+def tree_height(root):
+    """Height of a tree computed with an explicit stack (safe for degenerate trees)."""
+    best = 0
+    stack = [(root, 1)] if root else []
+    while stack:
+        node, depth = stack.pop()
+        best = max(best, depth)
+        if node.left:
+            stack.append((node.left, depth + 1))
+        if node.right:
+            stack.append((node.right, depth + 1))
+    return best
+
+
+def zipf_sampler(rng, n, s=1.1):
+    """Return a function drawing k keys from 0..n-1 with Zipf(s) popularity."""
+    cum_weights = list(accumulate(1.0 / (rank ** s) for rank in range(1, n + 1)))
+    # spread the popular keys over the key space instead of clustering them at 0
+    keys = list(range(n))
+    rng.shuffle(keys)
+    return lambda k: rng.choices(keys, cum_weights=cum_weights, k=k)
+
+
+def make_workload(name, n, seed):
+    """
+    Build the key streams for one workload.
+
+    Returns:
+        dict: Phase name -> list of keys, or for 'mixed' a list of (op, key).
+    """
+    rng = random.Random(seed)
+    if name == 'random':
+        keys = rng.sample(range(n * 10), n)
+        probes = rng.sample(range(n * 10), n)
+        return {'insert': keys, 'search': probes, 'remove': rng.sample(keys, n)}
+    if name == 'sorted':
+        keys = list(range(n))
+        return {'insert': keys, 'search': keys, 'remove': keys}
+    if name == 'reverse':
+        keys = list(range(n - 1, -1, -1))
+        return {'insert': keys, 'search': keys, 'remove': keys}
+    if name == 'zipf':
+        draw = zipf_sampler(rng, n)
+        return {'insert': draw(n), 'search': draw(n), 'remove': draw(n)}
+    if name == 'mixed':
+        preload = rng.sample(range(n * 10), n)
+        ops = []
+        for _ in range(n):
+            roll = rng.random()
+            op = 'search' if roll < 0.5 else 'insert' if roll < 0.75 else 'remove'
+            ops.append((op, rng.randrange(n * 10)))
+        return {'preload': preload, 'mixed': ops}
+    raise ValueError(f"unknown workload: {name}")
+
+
+def timed(fn, keys):
+    """
+    Call fn once per key and record each call's latency.
+
+    Returns:
+        dict: ops, ops_per_sec, p50_us and p99_us for the phase.
+    """
+    clock = time.perf_counter_ns
+    latencies = array('q')
+    record = latencies.append
+    start = clock()
+    for key in keys:
+        t0 = clock()
+        fn(key)
+        record(clock() - t0)
+    return summarize(latencies, clock() - start)
+
+
+def timed_mixed(engine, ops):
+    clock = time.perf_counter_ns
+    calls = {'search': engine.search, 'insert': engine.insert, 'remove': engine.remove}
+    latencies = array('q')
+    record = latencies.append
+    start = clock()
+    for op, key in ops:
+        fn = calls[op]
+        t0 = clock()
+        fn(key)
+        record(clock() - t0)
+    return summarize(latencies, clock() - start)
+
+
+def summarize(latencies, total_ns):
+    ordered = sorted(latencies)
+    count = len(ordered)
+    if not count:
+        return {'ops': 0, 'ops_per_sec': 0.0, 'p50_us': 0.0, 'p99_us': 0.0}
+    return {
+        'ops': count,
+        'ops_per_sec': round(count / (total_ns / 1e9), 1) if total_ns else 0.0,
+        'p50_us': round(ordered[count // 2] / 1e3, 3),
+        'p99_us': round(ordered[min(count - 1, (count * 99) // 100)] / 1e3, 3),
+    }
+
+
+def peak_memory(engine_cls, streams):
+    """Peak traced bytes while loading the workload into a fresh tree."""
+    keys = streams.get('insert', streams.get('preload'))
+    tracemalloc.start()
+    try:
+        engine = engine_cls()
+        for key in keys:
+            engine.insert(key)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(engine_cls, workload, n, seed, measure_memory):
+    streams = make_workload(workload, n, seed)
+    engine = engine_cls()
+    phases = {}
+    if workload == 'mixed':
+        for key in streams['preload']:
+            engine.insert(key)
+        phases['mixed'] = timed_mixed(engine, streams['mixed'])
+    else:
+        phases['insert'] = timed(engine.insert, streams['insert'])
+        phases['search'] = timed(engine.search, streams['search'])
+
+    height = engine.height()
+    start = time.perf_counter_ns()
+    visited = engine.traverse()
+    elapsed = time.perf_counter_ns() - start
+    phases['traverse'] = {
+        'ops': visited,
+        'ops_per_sec': round(visited / (elapsed / 1e9), 1) if elapsed else 0.0,
+    }
+    if workload != 'mixed':
+        phases['remove'] = timed(engine.remove, streams['remove'])
+
+    result = {
+        'engine': engine_cls.name,
+        'workload': workload,
+        'size': n,
+        'height': height,
+        'phases': phases,
+    }
+    if measure_memory:
+        result['peak_memory_bytes'] = peak_memory(engine_cls, streams)
+    return result
+
+
+def run(engines, workloads, sizes, seed=1, measure_memory=True, unbalanced_limit=20000, log=None):
+    """
+    Run every (engine, workload, size) combination.
+
+    VisualBST is quadratic on sorted and reverse-sorted input, so those cases are
+    skipped above `unbalanced_limit` keys and reported with a "skipped" reason.
+
+    Returns:
+        dict: JSON-serialisable report with a "meta" and a "results" section.
+    """
+    results = []
+    for n in sizes:
+        for workload in workloads:
+            for name in engines:
+                if name == 'VisualBST' and workload in DEGENERATE and n > unbalanced_limit:
+                    results.append({'engine': name, 'workload': workload, 'size': n,
+                                    'skipped': 'degenerate tree above --unbalanced-limit'})
+                    continue
+                if log:
+                    log(f"{name:<12} {workload:<8} n={n}")
+                results.append(run_case(ENGINES[name], workload, n, seed, measure_memory))
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'seed': seed,
+            'sizes': list(sizes),
+        },
+        'results': results,
+    }
+
+
+def _phase_rates(doc):
+    table = {}
+    for result in doc['results']:
+        for phase, stats in result.get('phases', {}).items():
+            table[(result['engine'], result['workload'], result['size'], phase)] = stats['ops_per_sec']
+    return table
+
+
+def compare(report, baseline, tolerance):
+    """
+    List phases whose throughput dropped by more than `tolerance` against a baseline.
+
+    Returns:
+        list: One dict per regression with the old and new ops/sec.
+    """
+    old = _phase_rates(baseline)
+    regressions = []
+    for key, new_rate in _phase_rates(report).items():
+        old_rate = old.get(key)
+        if old_rate and new_rate < old_rate * (1 - tolerance):
+            engine, workload, size, phase = key
+            regressions.append({
+                'engine': engine, 'workload': workload, 'size': size, 'phase': phase,
+                'baseline_ops_per_sec': old_rate, 'ops_per_sec': new_rate,
+                'change': round(new_rate / old_rate - 1, 3),
+            })
+    return regressions
+
+
+def unmatched(report, baseline):
+    """
+    List the phases of a run that have no row in the baseline, so compare() skipped them.
+
+    Returns:
+        list: One dict per unmatched phase.
+    """
+    old = _phase_rates(baseline)
+    return [{'engine': engine, 'workload': workload, 'size': size, 'phase': phase}
+            for engine, workload, size, phase in _phase_rates(report)
+            if (engine, workload, size, phase) not in old]
+
+
+def parse_sizes(text):
+    return [int(float(part)) for part in text.split(',') if part]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the BST engines.")
+    parser.add_argument('--engines', default=','.join(ENGINES),
+                        help="comma-separated engines (default: all)")
+    parser.add_argument('--workloads', default=','.join(WORKLOADS),
+                        help="comma-separated workloads (default: all)")
+    parser.add_argument('--sizes', default='1e3,1e4,1e5',
+                        help="comma-separated tree sizes, e.g. 1e3,1e5,1e7")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the tracemalloc pass that measures peak memory")
+    parser.add_argument('--unbalanced-limit', type=int, default=20000,
+                        help="largest sorted/reverse workload to run on VisualBST")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    parser.add_argument('--save-baseline', metavar='PATH', help="store this run as the baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare this run against a stored baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed throughput drop before --compare reports a regression")
+    args = parser.parse_args(argv)
+
+    engines = [name for name in args.engines.split(',') if name]
+    workloads = [name for name in args.workloads.split(',') if name]
+    for name in engines:
+        if name not in ENGINES:
+            parser.error(f"unknown engine: {name}")
+    for name in workloads:
+        if name not in WORKLOADS:
+            parser.error(f"unknown workload: {name}")
+
+    report = run(engines, workloads, parse_sizes(args.sizes), seed=args.seed,
+                 measure_memory=not args.no_memory, unbalanced_limit=args.unbalanced_limit,
+                 log=lambda line: print(line, file=sys.stderr))
+
+    status = 0
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        report['regressions'] = compare(report, baseline, args.tolerance)
+        report['unmatched'] = unmatched(report, baseline)
+        status = 1 if report['regressions'] else 0
+        total = len(_phase_rates(report))
+        if report['unmatched']:
+            print(f"warning: {len(report['unmatched'])} of {total} phases have no baseline row "
+                  f"in {args.compare} and were not compared", file=sys.stderr)
+        if total and len(report['unmatched']) == total:
+            print(f"error: no phase of this run matches {args.compare}; "
+                  f"rerun with the baseline's --sizes/--engines/--workloads", file=sys.stderr)
+            status = 1
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(text + '\n')
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as fh:
+            fh.write(text + '\n')
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,8 @@
 from graphviz import Digraph
 
 class TreeNode:
+    __slots__ = ('val', 'left', 'right')
+
     def __init__(self, val):
         self.val = val
         self.left = None
@@ -1,7 +1,20 @@
+import heapq
+import sys
+from itertools import islice
+
 from graphviz import Digraph
 
+import dotExport
+import batchLookup
+import snapshot
+import sortedMerge
+from frozenBST import FrozenBST
+from treeRenderer import BackgroundRenderer
+
 class TreeNode:
     """Class representing a node in the binary search tree."""
+    __slots__ = ('val', 'left', 'right', 'count')
+
     def __init__(self, val):
         """
         Initialize a new TreeNode.
@@ -12,17 +25,171 @@ class TreeNode:
         self.val = val
         self.left = None
         self.right = None
+        # number of copies of val; only grows above 1 in multiset mode
+        self.count = 1
 
 
 class VisualBST:
     """Class for a Binary Search Tree with visualization and traversal support."""
-    def __init__(self):
-        """Initialize the VisualBST with an empty root."""
+    def __init__(self, multiset=False):
+        """
+        Initialize the VisualBST with an empty root.
+
+        Args:
+            multiset (bool): Keep duplicate values by counting them in their
+                node instead of silently dropping them.
+        """
         self.root = None
+        self.multiset = multiset
+        # sorted keys for batch lookups; insert() and remove() drop it
+        self._sorted_keys = None
+
+    @classmethod
+    def from_sorted(cls, values, multiset=False):
+        """
+        Build a perfectly balanced BST from values that are already sorted.
+
+        Adjacent duplicates are dropped, or counted when multiset is True.
+        Runs in O(n) time.
+
+        Args:
+            values (iterable): Values in ascending order.
+            multiset (bool): Build a multiset tree.
+
+        Returns:
+            VisualBST: New tree containing the values.
+        """
+        tree = cls(multiset=multiset)
+        tree._replace(values)
+        return tree
+
+    @classmethod
+    def from_iterable(cls, values, multiset=False):
+        """
+        Build a perfectly balanced BST from values in any order.
+
+        The values are sorted (and deduplicated unless multiset is True) once,
+        then handed to from_sorted.
+
+        Args:
+            values (iterable): Values to load.
+            multiset (bool): Keep duplicates as counts.
+
+        Returns:
+            VisualBST: New tree containing the values.
+        """
+        return cls.from_sorted(sorted(values) if multiset else sorted(set(values)), multiset)
+
+    def _link(self, nodes, lo, hi):
+        """
+        Recursive helper that links nodes[lo..hi] into a balanced subtree.
+
+        Args:
+            nodes (list): Nodes in ascending order of value.
+            lo (int): First index of the slice.
+            hi (int): Last index of the slice.
+
+        Returns:
+            TreeNode: Root of the subtree, or None if the slice is empty.
+        """
+        if lo > hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node.left = self._link(nodes, lo, mid - 1)
+        node.right = self._link(nodes, mid + 1, hi)
+        return node
+
+    def contains_many(self, keys):
+        """
+        Look up a whole batch of values at once.
+
+        Uses a cached sorted copy of the tree and numpy.searchsorted when NumPy
+        is installed, or a single merged walk otherwise. The cache is rebuilt
+        after the next insert() or remove().
+
+        Args:
+            keys (list | numpy.ndarray): Values to look up.
+
+        Returns:
+            numpy.ndarray | list: Boolean mask aligned with keys.
+        """
+        return batchLookup.contains_many(self._snapshot(), keys)
+
+    def search_many(self, keys):
+        """
+        Return the values from keys that are in the BST, in input order.
+
+        Args:
+            keys (list | numpy.ndarray): Values to look up.
+
+        Returns:
+            numpy.ndarray | list: The values that were found.
+        """
+        return batchLookup.search_many(self._snapshot(), keys)
+
+    def _snapshot(self):
+        """
+        Return the cached sorted keys, rebuilding them if the tree changed.
+
+        Returns:
+            numpy.ndarray | list: Sorted values of the BST.
+        """
+        if self._sorted_keys is None:
+            self._sorted_keys = batchLookup.sorted_snapshot(self.iter_inorder(distinct=True))
+        return self._sorted_keys
+
+    def freeze(self):
+        """
+        Return an immutable, read-optimized copy of the BST.
+
+        Returns:
+            FrozenBST: Eytzinger-layout array supporting contains, floor, ceiling and rank.
+        """
+        return FrozenBST(self.iter_inorder(distinct=True))
+
+    def save(self, path, shape=True):
+        """
+        Write the BST to a binary snapshot file (see snapshot.py).
+
+        A multiset is written with every duplicate repeated, without its
+        shape, and flagged so that load() restores the counts.
+
+        Args:
+            path (str): Destination file.
+            shape (bool): Also store the preorder sequence so load() restores
+                the exact same tree instead of a balanced one.
+
+        Returns:
+            int: Number of values written.
+        """
+        preorder = self.iter_preorder() if shape and not self.multiset else None
+        return snapshot.write_snapshot(path, self.iter_inorder(), preorder, self.multiset)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Rebuild a BST from a snapshot file in O(n).
+
+        For read-only lookups without building any nodes, use
+        snapshot.open_snapshot(path) instead.
+
+        Args:
+            path (str): Snapshot written by save().
+
+        Returns:
+            VisualBST: The restored tree.
+        """
+        with snapshot.open_snapshot(path) as view:
+            if view.multiset or not view.has_shape:
+                return cls.from_sorted(view.keys, view.multiset)
+            tree = cls()
+            tree.root = snapshot.build_from_preorder(view.preorder, TreeNode)
+            return tree
 
     def searchBST(self, root, target):
         """
-        Recursively search for a value in the BST.
+        Iteratively search for a value in the BST.
 
         Args:
             root (TreeNode): The root node of the BST.
@@ -31,15 +198,15 @@ class VisualBST:
         Returns:
             TreeNode: Node containing the value, or None if not found.
         """
-        if not root:
-            return None
-        
-        if target == root.val:
-            return root
-        elif target < root.val:
-            return self.searchBST(root.left, target)
-        else:
-            return self.searchBST(root.right, target)
+        node = root
+        while node:
+            if target == node.val:
+                return node
+            elif target < node.val:
+                node = node.left
+            else:
+                node = node.right
+        return None
 
     def insert(self, root, val):
         """
@@ -52,15 +219,325 @@ class VisualBST:
         Returns:
             TreeNode: New root after insertion.
         """
-        newNode = TreeNode(val)
         if not root:
-            return newNode
-        if val < root.val:
-            root.left = self.insert(root.left, val)
-        elif val > root.val:
-            root.right = self.insert(root.right, val)
+            self._sorted_keys = None
+            return TreeNode(val)
+        node = root
+        while True:
+            if val < node.val:
+                if not node.left:
+                    node.left = TreeNode(val)
+                    break
+                node = node.left
+            elif val > node.val:
+                if not node.right:
+                    node.right = TreeNode(val)
+                    break
+                node = node.right
+            else:
+                if not self.multiset:
+                    return root
+                node.count += 1
+                break
+        self._sorted_keys = None
         return root
 
+    def insert_many(self, values):
+        """
+        Insert a batch of values in one pass.
+
+        The batch is sorted once, merged with the in-order sequence of the tree
+        and the result is rebuilt as a perfectly balanced BST, so the cost is
+        O(n + m log m) no matter how the batch is ordered. Batches small enough
+        to pass the cutoff in _small_batch() are inserted one by one instead,
+        which leaves the shape of the tree alone.
+
+        A multiset tree keeps the duplicates of the batch and merges with
+        heapq.merge instead, so that every copy is counted.
+
+        Args:
+            values (iterable): Values to insert.
+
+        Returns:
+            int: Number of values that were not already in the tree (in
+                multiset mode, the number of values inserted).
+        """
+        batch = sorted(values) if self.multiset else sorted(set(values))
+        if not batch:
+            return 0
+        if self._small_batch(len(batch)):
+            inserted = 0
+            for val in batch:
+                if self.multiset or not self.searchBST(self.root, val):
+                    inserted += 1
+                self.root = self.insert(self.root, val)
+            return inserted
+        existing = list(self.iter_inorder())
+        if self.multiset:
+            merged = list(heapq.merge(existing, batch))
+        else:
+            merged = list(sortedMerge.union(existing, batch))
+        self._replace(merged)
+        return len(merged) - len(existing)
+
+    def remove_many(self, values):
+        """
+        Remove a batch of values in one pass and rebuild the BST balanced.
+
+        As in insert_many(), small batches are removed one by one instead.
+
+        In a multiset tree each value of the batch removes one copy.
+
+        Args:
+            values (iterable): Values to remove.
+
+        Returns:
+            int: Number of values that were found and removed.
+        """
+        batch = sorted(values) if self.multiset else sorted(set(values))
+        if not batch:
+            return 0
+        if self._small_batch(len(batch)):
+            removed = 0
+            for val in batch:
+                self.root, found = self.remove(self.root, val)
+                removed += found
+            return removed
+        existing = list(self.iter_inorder())
+        remaining = list(sortedMerge.difference(existing, batch))
+        self._replace(remaining)
+        return len(existing) - len(remaining)
+
+    def _small_batch(self, m):
+        """
+        Decide whether m single-value updates are cheaper than a merge and rebuild.
+
+        Applies BalancedBST's m * (log2 n + 1) < n cutoff. The tree keeps no
+        size, so nodes are only counted up to 64 * m; past that the cutoff
+        holds for any realistic n.
+
+        Args:
+            m (int): Number of values in the batch.
+
+        Returns:
+            bool: True if the batch should be applied value by value.
+        """
+        limit = 64 * m
+        n = sum(1 for _ in islice(self._iter_preorder(self.root, True), limit))
+        return n == limit or m * (n.bit_length() + 1) < n
+
+    def remove_range(self, lo, hi):
+        """
+        Remove every value in the closed interval [lo, hi].
+
+        The tree is cut at lo and at hi along two root-to-leaf paths, the
+        middle piece is dropped as a whole and the part above hi is hung under
+        the largest value below lo. No successor values are copied around. The
+        cost is O(height) for the cuts plus O(k) to count the k removed values.
+
+        Args:
+            lo (int): Smallest value to remove.
+            hi (int): Largest value to remove.
+
+        Returns:
+            int: Number of values removed.
+        """
+        if hi < lo:
+            return 0
+        self._sorted_keys = None
+        below, rest = self._split(self.root, lo, False)
+        middle, above = self._split(rest, hi, True)
+        if below is None:
+            self.root = above
+        else:
+            node = below
+            while node.right:
+                node = node.right
+            node.right = above
+            self.root = below
+        return sum(1 for _ in self._iter_inorder(middle))
+
+    def _split(self, root, val, inclusive):
+        """
+        Top-down split of a subtree into two BSTs along a single path.
+
+        Args:
+            root (TreeNode): Root of the subtree to cut; its nodes are reused.
+            val (int): Split value.
+            inclusive (bool): Send val itself to the left part.
+
+        Returns:
+            tuple: (root of the values < val, root of the values >= val), or
+                (<= val, > val) when inclusive is True.
+        """
+        left_head = left_tail = TreeNode(None)
+        right_head = right_tail = TreeNode(None)
+        node = root
+        while node:
+            if node.val < val or (inclusive and node.val == val):
+                left_tail.right = node
+                left_tail = node
+                node = node.right
+            else:
+                right_tail.left = node
+                right_tail = node
+                node = node.left
+        left_tail.right = None
+        right_tail.left = None
+        return left_head.right, right_head.left
+
+    def union(self, other):
+        """
+        Return a new balanced BST holding the values of both trees.
+
+        Both trees are walked in order once and merged, so the cost is O(m + n).
+        Set operations compare distinct values: a multiset contributes each
+        value once and the result is a plain set tree.
+
+        Args:
+            other: Any tree, or any other iterable of values (e.g. a set),
+                which is sorted first.
+
+        Returns:
+            VisualBST: New tree; neither input is changed.
+        """
+        other = sortedMerge.as_sorted(other)
+        return self.from_sorted(sortedMerge.union(self.iter_inorder(distinct=True), other))
+
+    def intersection(self, other):
+        """
+        Return a new balanced BST holding the values found in both trees.
+
+        Args:
+            other: Tree or iterable, as for union().
+
+        Returns:
+            VisualBST: New tree; neither input is changed.
+        """
+        other = sortedMerge.as_sorted(other)
+        return self.from_sorted(sortedMerge.intersection(self.iter_inorder(distinct=True), other))
+
+    def difference(self, other):
+        """
+        Return a new balanced BST holding the values of this tree that are not in other.
+
+        Args:
+            other: Tree or iterable, as for union().
+
+        Returns:
+            VisualBST: New tree; neither input is changed.
+        """
+        other = sortedMerge.as_sorted(other)
+        return self.from_sorted(sortedMerge.difference(self.iter_inorder(distinct=True), other))
+
+    def symmetric_difference(self, other):
+        """
+        Return a new balanced BST holding the values found in exactly one of the trees.
+
+        Args:
+            other: Tree or iterable, as for union().
+
+        Returns:
+            VisualBST: New tree; neither input is changed.
+        """
+        other = sortedMerge.distinct(sortedMerge.as_sorted(other))
+        return self.from_sorted(sortedMerge.symmetric_difference(self.iter_inorder(distinct=True), other))
+
+    # The in-place forms below leave self equal to the matching pure operation,
+    # so a multiset becomes a plain set tree, just like the tree union() returns.
+
+    def update(self, other):
+        """
+        Add the values of other in place; same as self = self.union(other).
+
+        A set tree takes the insert_many() path, so small batches stay cheap.
+
+        Args:
+            other: Tree or iterable, as for union().
+        """
+        if not self.multiset:
+            self.insert_many(other)
+            return
+        other = sortedMerge.as_sorted(other)
+        self._assign(sortedMerge.union(self.iter_inorder(distinct=True), other))
+
+    def intersection_update(self, other):
+        """
+        Keep only the values that are also in other; same as self = self.intersection(other).
+
+        Args:
+            other: Tree or iterable, as for union().
+        """
+        other = sortedMerge.as_sorted(other)
+        self._assign(sortedMerge.intersection(self.iter_inorder(distinct=True), other))
+
+    def difference_update(self, other):
+        """
+        Remove the values that are in other; same as self = self.difference(other).
+
+        A set tree takes the remove_many() path, so small batches stay cheap.
+
+        Args:
+            other: Tree or iterable, as for union().
+        """
+        if not self.multiset:
+            self.remove_many(other)
+            return
+        other = sortedMerge.as_sorted(other)
+        self._assign(sortedMerge.difference(self.iter_inorder(distinct=True), other))
+
+    def symmetric_difference_update(self, other):
+        """
+        Keep the values found in exactly one of the trees; same as self = self.symmetric_difference(other).
+
+        Args:
+            other: Tree or iterable, as for union().
+        """
+        other = sortedMerge.distinct(sortedMerge.as_sorted(other))
+        self._assign(sortedMerge.symmetric_difference(self.iter_inorder(distinct=True), other))
+
+    def _assign(self, values):
+        """Replace the tree with the sorted result of a set operation, as a set tree."""
+        self.multiset = False
+        self._replace(values)
+
+    def _replace(self, keys):
+        """
+        Rebuild self.root as a balanced BST from a sorted key stream.
+
+        The stream is drained before any node is touched, because it is
+        usually still walking the current tree. Repeated values become node
+        counts in a multiset and are dropped otherwise. Values already in the
+        tree keep their nodes, which are only relinked, so new nodes are
+        allocated just for values that come from elsewhere; the sorted value
+        and count lists are still O(n) scratch space.
+
+        Args:
+            keys (iterable): Values in ascending order.
+        """
+        unique = []
+        counts = []
+        for val in keys:
+            if not unique or val != unique[-1]:
+                unique.append(val)
+                counts.append(1)
+            else:
+                counts[-1] += 1
+        nodes = []
+        old = snapshot.inorder_nodes(self.root)
+        node = next(old, None)
+        for val, count in zip(unique, counts):
+            while node is not None and node.val < val:
+                node = next(old, None)
+            if node is not None and node.val == val:
+                nodes.append(node)
+                node = next(old, None)
+            else:
+                nodes.append(TreeNode(val))
+            nodes[-1].count = count if self.multiset else 1
+        self._sorted_keys = None
+        self.root = self._link(nodes, 0, len(nodes) - 1)
+
     def findMin(self, root):
         """
         Find the node with the minimum value in a BST.
@@ -87,85 +564,328 @@ class VisualBST:
         Returns:
             tuple: (Updated root TreeNode, Boolean indicating if node was removed)
         """
-        if not root:
-            return None, False
-
-        if val < root.val:
-            root.left, removed = self.remove(root.left, val)
-            return root, removed
-        elif val > root.val:
-            root.right, removed = self.remove(root.right, val)
-            return root, removed
+        parent = None
+        node = root
+        while node and val != node.val:
+            parent = node
+            node = node.left if val < node.val else node.right
+        if not node:
+            return root, False
+        self._sorted_keys = None
+        if node.count > 1:
+            node.count -= 1
+            return root, True
+
+        if node.left and node.right:
+            # copy the in-order successor up, then unlink it instead
+            succParent = node
+            succ = node.right
+            while succ.left:
+                succParent = succ
+                succ = succ.left
+            node.val = succ.val
+            node.count = succ.count
+            parent, node = succParent, succ
+
+        child = node.left if node.left else node.right
+        if not parent:
+            return child, True
+        if parent.left is node:
+            parent.left = child
         else:
-            if not root.left:
-                return root.right, True
-            elif not root.right:
-                return root.left, True
+            parent.right = child
+        return root, True
+
+    def min(self):
+        """
+        Return the smallest value in the BST.
+
+        Returns:
+            int: Smallest value, or None if the tree is empty.
+        """
+        node = self.findMin(self.root)
+        return node.val if node else None
+
+    def max(self):
+        """
+        Return the largest value in the BST.
+
+        Returns:
+            int: Largest value, or None if the tree is empty.
+        """
+        node = self.root
+        while node and node.right:
+            node = node.right
+        return node.val if node else None
+
+    def floor(self, val):
+        """
+        Find the largest value <= val.
+
+        Args:
+            val (int): Probe value; it does not have to be in the tree.
+
+        Returns:
+            int: The floor of val, or None if every value is larger.
+        """
+        return self._below(val, True)
+
+    def ceiling(self, val):
+        """
+        Find the smallest value >= val.
+
+        Args:
+            val (int): Probe value; it does not have to be in the tree.
+
+        Returns:
+            int: The ceiling of val, or None if every value is smaller.
+        """
+        return self._above(val, True)
+
+    def predecessor(self, val):
+        """
+        Find the largest value strictly smaller than val.
+
+        Args:
+            val (int): Probe value; it does not have to be in the tree.
+
+        Returns:
+            int: The predecessor of val, or None if there is none.
+        """
+        return self._below(val, False)
+
+    def successor(self, val):
+        """
+        Find the smallest value strictly larger than val.
+
+        Args:
+            val (int): Probe value; it does not have to be in the tree.
+
+        Returns:
+            int: The successor of val, or None if there is none.
+        """
+        return self._above(val, False)
+
+    def _below(self, val, inclusive):
+        """
+        Walk one root-to-leaf path, remembering the last value that fits below val.
+
+        Args:
+            val (int): Probe value.
+            inclusive (bool): Accept val itself.
+
+        Returns:
+            int: The closest value below val, or None.
+        """
+        best = None
+        node = self.root
+        while node:
+            if node.val < val or (inclusive and node.val == val):
+                best = node.val
+                node = node.right
+            else:
+                node = node.left
+        return best
+
+    def _above(self, val, inclusive):
+        """
+        Mirror image of _below: the closest value above val, or None.
+        """
+        best = None
+        node = self.root
+        while node:
+            if node.val > val or (inclusive and node.val == val):
+                best = node.val
+                node = node.left
             else:
-                minNode = self.findMin(root.right)
-                root.val = minNode.val
-                root.right, _ = self.remove(root.right, minNode.val)
-                return root, True
+                node = node.right
+        return best
 
-    def inorder(self, root):
+    def range(self, lo, hi):
+        """
+        Lazily yield the values in the closed interval [lo, hi].
+
+        Only the path down to lo and the k matching values are visited, so a
+        query costs O(height + k) instead of a full in-order traversal.
+
+        Args:
+            lo (int): Smallest value to yield.
+            hi (int): Largest value to yield.
+
+        Yields:
+            int: Values in sorted order.
+        """
+        for val in self._iter_inorder(self.root, lo):
+            if val > hi:
+                return
+            yield val
+
+    def inorder(self, root, distinct=False):
         """
         Perform in-order traversal of the BST.
 
         Args:
             root (TreeNode): Root of the tree.
+            distinct (bool): List each value once even if a multiset holds it several times.
 
         Returns:
             list: Values in in-order sequence.
         """
-        values = []
-        def inorderHelper(node):
-            if not node:
-                return 
-            inorderHelper(node.left)
-            values.append(node.val)
-            inorderHelper(node.right)
-        inorderHelper(root)
-        return values
+        return list(self._iter_inorder(root, distinct=distinct))
 
-    def preorder(self, root):
+    def preorder(self, root, distinct=False):
         """
         Perform pre-order traversal of the BST.
 
         Args:
             root (TreeNode): Root of the tree.
+            distinct (bool): List each value once even if a multiset holds it several times.
 
         Returns:
             list: Values in pre-order sequence.
         """
-        values = []
-        def inorderHelper(node):
-            if not node:
-                return 
-            values.append(node.val)
-            inorderHelper(node.left)
-            inorderHelper(node.right)
-        inorderHelper(root)
-        return values
+        return list(self._iter_preorder(root, distinct=distinct))
 
-    def postorder(self, root):
+    def postorder(self, root, distinct=False):
         """
         Perform post-order traversal of the BST.
 
         Args:
             root (TreeNode): Root of the tree.
+            distinct (bool): List each value once even if a multiset holds it several times.
 
         Returns:
             list: Values in post-order sequence.
         """
-        values = []
-        def inorderHelper(node):
-            if not node:
-                return 
-            inorderHelper(node.left)
-            inorderHelper(node.right)
-            values.append(node.val)
-        inorderHelper(root)
-        return values
+        return list(self._iter_postorder(root, distinct=distinct))
+
+    def __iter__(self):
+        """Iterate over the values of the tree in sorted order."""
+        return self._iter_inorder(self.root)
+
+    def iter_inorder(self, start=None, distinct=False):
+        """
+        Lazily yield values in in-order sequence using O(height) memory.
+
+        Args:
+            start (int, optional): Skip values smaller than this, which lets a
+                caller resume a traversal from the last value it saw.
+            distinct (bool): Yield each value once even if a multiset holds
+                it several times.
+
+        Yields:
+            int: Values in sorted order.
+        """
+        return self._iter_inorder(self.root, start, distinct)
+
+    def iter_preorder(self, distinct=False):
+        """
+        Lazily yield values in pre-order sequence.
+
+        Args:
+            distinct (bool): Yield each value once, as for iter_inorder().
+
+        Yields:
+            int: Values in root-left-right order.
+        """
+        return self._iter_preorder(self.root, distinct)
+
+    def iter_postorder(self, distinct=False):
+        """
+        Lazily yield values in post-order sequence.
+
+        Args:
+            distinct (bool): Yield each value once, as for iter_inorder().
+
+        Yields:
+            int: Values in left-right-root order.
+        """
+        return self._iter_postorder(self.root, distinct)
+
+    def _iter_inorder(self, root, start=None, distinct=False):
+        """
+        Explicit-stack in-order generator.
+
+        Args:
+            root (TreeNode): Root of the tree/subtree.
+            start (int, optional): Smallest value to yield.
+            distinct (bool): Collapse the copies counted in a multiset node.
+
+        Yields:
+            int: Values in sorted order.
+        """
+        stack = []
+        node = root
+        if start is not None:
+            # only keep the ancestors whose values are still ahead of us
+            while node:
+                if node.val >= start:
+                    stack.append(node)
+                    node = node.left
+                else:
+                    node = node.right
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.val
+            if node.count > 1 and not distinct:
+                for _ in range(node.count - 1):
+                    yield node.val
+            node = node.right
+
+    def _iter_preorder(self, root, distinct=False):
+        """
+        Explicit-stack pre-order generator.
+
+        Args:
+            root (TreeNode): Root of the tree/subtree.
+            distinct (bool): Collapse the copies counted in a multiset node.
+
+        Yields:
+            int: Values in root-left-right order.
+        """
+        stack = [root] if root else []
+        while stack:
+            node = stack.pop()
+            yield node.val
+            if node.count > 1 and not distinct:
+                for _ in range(node.count - 1):
+                    yield node.val
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+
+    def _iter_postorder(self, root, distinct=False):
+        """
+        Explicit-stack post-order generator.
+
+        Args:
+            root (TreeNode): Root of the tree/subtree.
+            distinct (bool): Collapse the copies counted in a multiset node.
+
+        Yields:
+            int: Values in left-right-root order.
+        """
+        stack = []
+        node = root
+        lastVisited = None
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+                continue
+            peek = stack[-1]
+            if peek.right and lastVisited is not peek.right:
+                node = peek.right
+            else:
+                yield peek.val
+                if peek.count > 1 and not distinct:
+                    for _ in range(peek.count - 1):
+                        yield peek.val
+                lastVisited = stack.pop()
 
     def get_suffix(self, level):
         """
@@ -182,12 +902,13 @@ class VisualBST:
         last_digit = level % 10
         return {1: "st", 2: "nd", 3: "rd"}.get(last_digit, "th")
 
-    def bfs(self, root):
+    def bfs(self, root, distinct=False):
         """
         Perform level-order traversal (Breadth-First Search) of the BST.
 
         Args:
             root (TreeNode): Root of the tree.
+            distinct (bool): Print each value once even if a multiset holds it several times.
         """
         from collections import deque
         queue = deque()
@@ -202,7 +923,8 @@ class VisualBST:
             print(f"{level + 1}{suffix} Level of the tree is:", end=' ')
             for _ in range(level_size):
                 node = queue.popleft()
-                print(node.val, end=' ')
+                for _ in range(1 if distinct else node.count):
+                    print(node.val, end=' ')
                 if node.left:
                     queue.append(node.left)
                 if node.right:
@@ -231,17 +953,56 @@ class VisualBST:
         path.pop()
         return False
 
-    def draw(self, filename='bst'):
+    def draw(self, filename='bst', view=True):
         """
         Generate a visual PNG of the current BST using Graphviz.
 
         Args:
             filename (str): Name of the output file (default is 'bst').
+            view (bool): Open the rendered image in the system viewer.
+        """
+        dot = self.build_digraph()
+        dot.render(filename, view=view, format='png')
+        print(f"\nTree rendered and saved as '{filename}.png'")
+
+    def build_digraph(self):
+        """
+        Build the Graphviz description of the current BST without rendering it.
+
+        Returns:
+            Digraph: Graph with one node per tree node.
         """
         dot = Digraph()
         self._add_nodes_edges(self.root, dot)
-        dot.render(filename, view=True, format='png')
-        print(f"\nTree rendered and saved as '{filename}.png'")
+        return dot
+
+    def export_dot(self, path, start=None, max_depth=None, collapse_size=None):
+        """
+        Stream the BST to a DOT file without building a Digraph in memory.
+
+        Subtrees below max_depth, or with more than collapse_size values, are
+        drawn as one summary node with their value count and range. The nodes
+        keep no subtree size, so collapse_size costs one extra O(n) pass to
+        count them. Convert the result with dotExport.render_svg().
+
+        Args:
+            path (str): Output file path.
+            start (int, optional): Export only the subtree rooted at this value.
+            max_depth (int, optional): Deepest level to draw node by node.
+            collapse_size (int, optional): Collapse subtrees with more values than this.
+
+        Returns:
+            int: Number of DOT nodes written.
+
+        Raises:
+            KeyError: If start is not in the tree.
+        """
+        root = self.root
+        if start is not None:
+            root = self.searchBST(self.root, start)
+            if root is None:
+                raise KeyError(start)
+        return dotExport.export_dot(root, path, max_depth=max_depth, collapse_size=collapse_size)
 
     def _add_nodes_edges(self, node, dot, parent=None):
         """
@@ -254,7 +1015,8 @@ class VisualBST:
         """
         if node is None:
             return
-        dot.node(str(id(node)), str(node.val))
+        label = str(node.val) if node.count == 1 else f"{node.val} (x{node.count})"
+        dot.node(str(id(node)), label)
         if parent:
             dot.edge(str(id(parent)), str(id(node)))
         if node.left:
@@ -265,7 +1027,7 @@ class VisualBST:
 
 
 # ------------------ MAIN PROGRAM ------------------
-def main():
+def main(headless=False):
     """
     Interactive Binary Search Tree (BST) visualizer and manipulator.
 
@@ -275,10 +1037,15 @@ def main():
     - Check if a path exists from root to leaf
     - Visualize the BST using Graphviz (if installed)
 
+    The tree is rendered on a background thread after each change, so the menu
+    never waits for Graphviz. With headless=True (or the --headless flag) the
+    PNG is still written but no image viewer is opened.
+
     Usage:
     Run the script and follow the on-screen menu options.
     """
     tree = VisualBST()
+    renderer = BackgroundRenderer(tree, "bst_tree", view=not headless)
 
     while True:
         print("\n")
@@ -299,14 +1066,16 @@ def main():
 
         # QUIT
         if choice == 'q':
+            renderer.close(flush=False)
             break
         
         # INSERT
         elif choice == "i":
             try:
                 val = int(input("\nEnter value to insert to BST:  >>  "))
-                tree.root = tree.insert(tree.root, val)
-                tree.draw("bst_tree")
+                with renderer.lock:
+                    tree.root = tree.insert(tree.root, val)
+                renderer.request()
 
             except ValueError:
                 print("⚠️ Please enter a valid number.")
@@ -332,8 +1101,9 @@ def main():
         elif choice == "r":
             try:
                 val = int(input("\nEnter value to delete.  >>  "))
-                tree.root, removed = tree.remove(tree.root, val)
-                tree.draw("bst_tree")
+                with renderer.lock:
+                    tree.root, removed = tree.remove(tree.root, val)
+                renderer.request()
 
                 if removed:
                     print(f"Value {val} is deleted succesfully from the tree ✅.")
@@ -380,7 +1150,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(headless="--headless" in sys.argv)
 
 
 
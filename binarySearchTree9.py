@@ -1,36 +1,165 @@
+import heapq
+import sys
 from collections import deque
 from graphviz import Digraph
 
+import dotExport
+import batchLookup
+import snapshot
+import sortedMerge
+from frozenBST import FrozenBST
+from treeRenderer import BackgroundRenderer
+
 class TreeNode:
+    # count > 1 only in multiset mode; size is the sum of counts in the subtree
+    __slots__ = ('left', 'right', 'val', 'height', 'size', 'count')
+
     def __init__(self, key):
         self.left = None
         self.right = None
         self.val = key
+        self.height = 1
+        self.size = 1
+        self.count = 1
 
 class BalancedBST:
-    def __init__(self):
+    def __init__(self, multiset=False):
+        """
+        Args:
+            multiset (bool): Keep duplicate keys as a per-node count instead of dropping them.
+        """
         self.root = None
+        self.multiset = multiset
+        # sorted keys for batch lookups; every mutation drops it
+        self._sorted_keys = None
+
+    @classmethod
+    def from_sorted(cls, keys, multiset=False):
+        """
+        Build a perfectly balanced tree from keys that are already sorted, in O(n).
+
+        Args:
+            keys (iterable): Keys in ascending order; adjacent duplicates are
+                dropped, or counted when multiset is True.
+            multiset (bool): Build a multiset tree.
+
+        Returns:
+            BalancedBST: New tree containing the keys.
+        """
+        tree = cls(multiset=multiset)
+        tree._replace(keys)
+        return tree
+
+    @classmethod
+    def from_iterable(cls, keys, multiset=False):
+        """
+        Build a perfectly balanced tree from keys in any order.
+
+        Args:
+            keys (iterable): Keys to load.
+            multiset (bool): Keep duplicates as counts.
+
+        Returns:
+            BalancedBST: New tree containing the keys.
+        """
+        return cls.from_sorted(sorted(keys) if multiset else sorted(set(keys)), multiset)
+
+    def _link(self, nodes, lo, hi):
+        if lo > hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node.left = self._link(nodes, lo, mid - 1)
+        node.right = self._link(nodes, mid + 1, hi)
+        self._update(node)
+        return node
+
+    def contains_many(self, keys):
+        """
+        Batch membership test against a cached sorted snapshot (see batchLookup.py).
+
+        Args:
+            keys (list | numpy.ndarray): Keys to look up.
+
+        Returns:
+            numpy.ndarray | list: Boolean mask aligned with keys.
+        """
+        return batchLookup.contains_many(self._snapshot(), keys)
+
+    def search_many(self, keys):
+        """
+        Return the keys from the batch that are in the tree, in input order.
+        """
+        return batchLookup.search_many(self._snapshot(), keys)
+
+    def _snapshot(self):
+        if self._sorted_keys is None:
+            self._sorted_keys = batchLookup.sorted_snapshot(self.iter_inorder(distinct=True))
+        return self._sorted_keys
+
+    def freeze(self):
+        """
+        Return an immutable Eytzinger-layout copy for read-heavy traffic (see frozenBST.py).
+        """
+        return FrozenBST(self.iter_inorder(distinct=True))
+
+    def save(self, path, shape=True):
+        """
+        Write the tree to a binary snapshot file (see snapshot.py).
+
+        A multiset tree is written with every duplicate repeated, without the
+        shape, and flagged so that load() restores the counts.
+
+        Args:
+            path (str): Destination file.
+            shape (bool): Also store the preorder sequence so load() restores the exact layout.
+
+        Returns:
+            int: Number of keys written.
+        """
+        preorder = self.iter_preorder() if shape and not self.multiset else None
+        return snapshot.write_snapshot(path, self.iter_inorder(), preorder, self.multiset)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Rebuild a tree from a snapshot file in O(n).
+
+        The stored shape is restored only if it is a valid AVL shape; a file
+        saved by another engine (e.g. a VisualBST chain) is rebuilt balanced.
+        For read-only lookups without building any nodes, use snapshot.open_snapshot(path).
+        """
+        with snapshot.open_snapshot(path) as view:
+            if view.multiset or not view.has_shape:
+                return cls.from_sorted(view.keys, view.multiset)
+            tree = cls()
+            tree.root = snapshot.build_from_preorder(view.preorder, TreeNode)
+            for node in snapshot.postorder_nodes(tree.root):
+                tree._update(node)
+                if abs(tree.getBalance(node)) > 1:
+                    return cls.from_sorted(view.keys)
+        return tree
 
     def insert(self, key):
-        if not self.root:
-            self.root = TreeNode(key)
-        else:
-            self.root = self._insert(self.root, key)
-        self.root = self.balance(self.root)
+        self.root = self._insert(self.root, key)
 
     def _insert(self, node, key):
         if node is None:
+            self._sorted_keys = None
             return TreeNode(key)
         if key < node.val:
             node.left = self._insert(node.left, key)
         elif key > node.val:
             node.right = self._insert(node.right, key)
-        return node
+        elif self.multiset:
+            self._sorted_keys = None
+            node.count += 1
+        else:
+            return node
+        return self.balance(node)
 
     def remove(self, key):
-        if self.root:
-            self.root = self._remove(self.root, key)
-            self.root = self.balance(self.root)
+        self.root = self._remove(self.root, key)
 
     def _remove(self, node, key):
         if node is None:
@@ -39,15 +168,266 @@ class BalancedBST:
             node.left = self._remove(node.left, key)
         elif key > node.val:
             node.right = self._remove(node.right, key)
+        elif node.count > 1:
+            self._sorted_keys = None
+            node.count -= 1
         else:
+            self._sorted_keys = None
             if node.left is None:
                 return node.right
             elif node.right is None:
                 return node.left
-            temp = self.findMin(node.right)
-            node.val = temp.val
-            node.right = self._remove(node.right, temp.val)
-        return node
+            node.right, successor = self._pop_min(node.right)
+            node.val = successor.val
+            node.count = successor.count
+        return self.balance(node)
+
+    def insert_many(self, keys):
+        """
+        Insert a batch of keys.
+
+        Small batches are inserted one by one. Once m * log n reaches n, the
+        sorted batch is merged with the in-order keys instead and the tree is
+        rebuilt balanced in a single O(n + m log m) pass. A multiset keeps the
+        duplicates of the batch and merges with heapq.merge, so every copy is
+        counted.
+
+        Args:
+            keys (iterable): Keys to insert.
+
+        Returns:
+            int: Number of keys that were not already present (in multiset mode,
+                the number of keys inserted).
+        """
+        batch = sorted(keys) if self.multiset else sorted(set(keys))
+        n = len(self)
+        if len(batch) * (n.bit_length() + 1) < n:
+            for key in batch:
+                self.insert(key)
+        elif self.multiset:
+            self._replace(heapq.merge(self.iter_inorder(), batch))
+        else:
+            self._replace(sortedMerge.union(self.iter_inorder(), batch))
+        return len(self) - n
+
+    def remove_many(self, keys):
+        """
+        Remove a batch of keys, switching to one merge-and-rebuild pass for large batches.
+
+        In a multiset each key of the batch removes one copy.
+
+        Returns:
+            int: Number of keys that were removed.
+        """
+        batch = sorted(keys) if self.multiset else sorted(set(keys))
+        n = len(self)
+        if len(batch) * (n.bit_length() + 1) < n:
+            for key in batch:
+                self.remove(key)
+        else:
+            self._replace(sortedMerge.difference(self.iter_inorder(), batch))
+        return n - len(self)
+
+    def remove_range(self, lo, hi):
+        """
+        Remove every key in [lo, hi] in O(log n).
+
+        The tree is split at lo and hi and the outer parts are joined back
+        together, so the whole range is dropped as one subtree instead of being
+        removed key by key.
+
+        Returns:
+            int: Number of keys removed.
+        """
+        if hi < lo:
+            return 0
+        self._sorted_keys = None
+        left, rest = self._split(self.root, lo)
+        middle, right = self._split(rest, hi, inclusive=True)
+        self.root = self._join2(left, right)
+        return self.size(middle)
+
+    def union(self, other):
+        """
+        Return a new balanced tree with the keys of both trees, in O(m + n).
+
+        Set operations compare distinct keys, so duplicates in a multiset are
+        counted once and the result is a plain set tree.
+
+        Args:
+            other: Any tree, or any other iterable of keys (e.g. a set), which is sorted first.
+        """
+        other = sortedMerge.as_sorted(other)
+        return self.from_sorted(sortedMerge.union(self.iter_inorder(distinct=True), other))
+
+    def intersection(self, other):
+        """Return a new balanced tree with the keys found in both trees."""
+        other = sortedMerge.as_sorted(other)
+        return self.from_sorted(sortedMerge.intersection(self.iter_inorder(distinct=True), other))
+
+    def difference(self, other):
+        """Return a new balanced tree with the keys of this tree that are not in other."""
+        other = sortedMerge.as_sorted(other)
+        return self.from_sorted(sortedMerge.difference(self.iter_inorder(distinct=True), other))
+
+    def symmetric_difference(self, other):
+        """Return a new balanced tree with the keys found in exactly one of the trees."""
+        other = sortedMerge.distinct(sortedMerge.as_sorted(other))
+        return self.from_sorted(sortedMerge.symmetric_difference(self.iter_inorder(distinct=True), other))
+
+    # The in-place forms below leave self equal to the matching pure operation,
+    # so a multiset becomes a plain set tree, just like the tree union() returns.
+
+    def update(self, other):
+        """Add the keys of other in place; same as self = self.union(other)."""
+        if not self.multiset:
+            self.insert_many(other)
+            return
+        other = sortedMerge.as_sorted(other)
+        self._assign(sortedMerge.union(self.iter_inorder(distinct=True), other))
+
+    def intersection_update(self, other):
+        """Keep only the keys that are also in other; same as self = self.intersection(other)."""
+        other = sortedMerge.as_sorted(other)
+        self._assign(sortedMerge.intersection(self.iter_inorder(distinct=True), other))
+
+    def difference_update(self, other):
+        """Remove the keys of other in place; same as self = self.difference(other)."""
+        if not self.multiset:
+            self.remove_many(other)
+            return
+        other = sortedMerge.as_sorted(other)
+        self._assign(sortedMerge.difference(self.iter_inorder(distinct=True), other))
+
+    def symmetric_difference_update(self, other):
+        """Keep the keys found in exactly one of the trees; same as self = self.symmetric_difference(other)."""
+        other = sortedMerge.distinct(sortedMerge.as_sorted(other))
+        self._assign(sortedMerge.symmetric_difference(self.iter_inorder(distinct=True), other))
+
+    def _assign(self, keys):
+        self.multiset = False
+        self._replace(keys)
+
+    def _replace(self, keys):
+        """
+        Rebuild the tree perfectly balanced from a sorted key stream.
+
+        Keys already in the tree keep their nodes, which are only relinked, so
+        new nodes are allocated just for keys that come from elsewhere. The
+        sorted key and count lists are still O(n) scratch space.
+        """
+        # drain the stream first: it is usually still walking the current tree
+        unique = []
+        counts = []
+        for key in keys:
+            if not unique or key != unique[-1]:
+                unique.append(key)
+                counts.append(1)
+            else:
+                counts[-1] += 1
+        nodes = []
+        old = self._reusable_nodes()
+        node = next(old, None)
+        for key, count in zip(unique, counts):
+            while node is not None and node.val < key:
+                node = next(old, None)
+            if node is not None and node.val == key:
+                nodes.append(node)
+                node = next(old, None)
+            else:
+                nodes.append(TreeNode(key))
+            nodes[-1].count = count if self.multiset else 1
+        self._sorted_keys = None
+        self.root = self._link(nodes, 0, len(nodes) - 1)
+
+    def _reusable_nodes(self):
+        return snapshot.inorder_nodes(self.root)
+
+    def split(self, key):
+        """
+        Cut the tree at key in O(log n).
+
+        The nodes are moved, not copied, so this tree is left empty.
+
+        Args:
+            key: Split point; it does not have to be in the tree.
+
+        Returns:
+            tuple: (left, right) trees holding the keys < key and >= key.
+        """
+        left, right = self.__class__(self.multiset), self.__class__(self.multiset)
+        left.root, right.root = self._split(self.root, key)
+        self.root = None
+        self._sorted_keys = None
+        return left, right
+
+    @classmethod
+    def join(cls, left, right):
+        """
+        Concatenate two trees in O(log n) when every key of left is smaller than every key of right.
+
+        Both input trees are consumed and left empty.
+
+        Returns:
+            BalancedBST: Tree holding the keys of both inputs.
+
+        Raises:
+            ValueError: If the key ranges overlap.
+        """
+        tree = cls(left.multiset or right.multiset)
+        tree.root = tree._join_trees(left, right)
+        for part in (left, right):
+            part.root = None
+            part._sorted_keys = None
+        return tree
+
+    def _join_trees(self, left, right):
+        if left.root is not None and right.root is not None and left.max() >= right.min():
+            raise ValueError("join() needs every key of left to be smaller than every key of right")
+        return self._join2(left.root, right.root)
+
+    def _split(self, node, key, inclusive=False):
+        # inclusive=True sends key itself to the left part
+        if node is None:
+            return None, None
+        if key < node.val or (key == node.val and not inclusive):
+            left, right = self._split(node.left, key, inclusive)
+            return left, self._join3(right, node, node.right)
+        left, right = self._split(node.right, key, inclusive)
+        return self._join3(node.left, node, left), right
+
+    def _join3(self, left, mid, right):
+        """
+        Join left < mid < right into one AVL tree.
+
+        Descends the taller side until the heights are within one, hangs mid
+        there and rebalances on the way back up, so the cost is O(|hl - hr| + 1).
+        """
+        hl, hr = self.height(left), self.height(right)
+        if hl > hr + 1:
+            left.right = self._join3(left.right, mid, right)
+            return self.balance(left)
+        if hr > hl + 1:
+            right.left = self._join3(left, mid, right.left)
+            return self.balance(right)
+        mid.left, mid.right = left, right
+        self._update(mid)
+        return mid
+
+    def _join2(self, left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        right, mid = self._pop_min(right)
+        return self._join3(left, mid, right)
+
+    def _pop_min(self, node):
+        """Detach the smallest node; returns (new subtree root, detached node)."""
+        if node.left is None:
+            return node.right, node
+        node.left, smallest = self._pop_min(node.left)
+        return self.balance(node), smallest
 
     def findMin(self, node):
         current = node
@@ -66,8 +446,20 @@ class BalancedBST:
         return self._search(node.right, key)
 
     def balance(self, node):
+        """
+        Refresh the cached height of a node and rotate it if it is out of balance.
+
+        Called on every node along the insert/remove path on the way back up.
+
+        Args:
+            node (TreeNode): Node to rebalance.
+
+        Returns:
+            TreeNode: Root of the rebalanced subtree.
+        """
         if node is None:
             return node
+        self._update(node)
         balance_factor = self.getBalance(node)
         if balance_factor > 1:
             if self.getBalance(node.left) < 0:
@@ -87,13 +479,150 @@ class BalancedBST:
     def height(self, node):
         if node is None:
             return 0
-        return 1 + max(self.height(node.left), self.height(node.right))
+        return node.height
+
+    def size(self, node):
+        if node is None:
+            return 0
+        return node.size
+
+    def _update(self, node):
+        node.height = 1 + max(self.height(node.left), self.height(node.right))
+        node.size = node.count + self.size(node.left) + self.size(node.right)
+
+    def __len__(self):
+        return self.size(self.root)
+
+    def rank(self, key):
+        """
+        Count the keys strictly smaller than key in O(log n).
+
+        Args:
+            key: Key to rank; it does not have to be in the tree.
+
+        Returns:
+            int: Number of keys < key, i.e. the index key has (or would have) in inorder().
+        """
+        return self._rank(key, False)
+
+    def _rank(self, key, inclusive):
+        count = 0
+        node = self.root
+        while node:
+            if key < node.val or (key == node.val and not inclusive):
+                node = node.left
+            else:
+                count += self.size(node.left) + node.count
+                node = node.right
+        return count
+
+    def select(self, k):
+        """
+        Return the k-th smallest key (0-based) in O(log n).
+
+        Args:
+            k (int): Position in sorted order; negative values count from the end.
+
+        Returns:
+            The key at position k.
+
+        Raises:
+            IndexError: If k is out of range.
+        """
+        n = len(self)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("select index out of range")
+        node = self.root
+        while True:
+            left_size = self.size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k < left_size + node.count:
+                return node.val
+            else:
+                k -= left_size + node.count
+                node = node.right
+
+    def count_range(self, lo, hi):
+        """
+        Count the keys in the closed interval [lo, hi] in O(log n).
+        """
+        if hi < lo:
+            return 0
+        return self._rank(hi, True) - self._rank(lo, False)
+
+    def min(self):
+        """Smallest key, or None if the tree is empty."""
+        return self.findMin(self.root).val if self.root else None
+
+    def max(self):
+        """Largest key, or None if the tree is empty."""
+        node = self.root
+        if node is None:
+            return None
+        while node.right is not None:
+            node = node.right
+        return node.val
+
+    def floor(self, key):
+        """Largest key <= key, or None."""
+        return self._below(key, True)
+
+    def ceiling(self, key):
+        """Smallest key >= key, or None."""
+        return self._above(key, True)
+
+    def predecessor(self, key):
+        """Largest key < key, or None; key does not have to be in the tree."""
+        return self._below(key, False)
+
+    def successor(self, key):
+        """Smallest key > key, or None; key does not have to be in the tree."""
+        return self._above(key, False)
+
+    def _below(self, key, inclusive):
+        best = None
+        node = self.root
+        while node:
+            if node.val < key or (inclusive and node.val == key):
+                best = node.val
+                node = node.right
+            else:
+                node = node.left
+        return best
+
+    def _above(self, key, inclusive):
+        best = None
+        node = self.root
+        while node:
+            if node.val > key or (inclusive and node.val == key):
+                best = node.val
+                node = node.left
+            else:
+                node = node.right
+        return best
+
+    def range(self, lo, hi):
+        """
+        Lazily yield the keys in [lo, hi] in ascending order, in O(log n + k).
+
+        The scan starts from the path to lo (see iter_inorder) and stops at the
+        first key above hi, so subtrees outside the interval are never entered.
+        """
+        for key in self.iter_inorder(lo):
+            if key > hi:
+                return
+            yield key
 
     def rotateLeft(self, z):
         y = z.right
         T2 = y.left
         y.left = z
         z.right = T2
+        self._update(z)
+        self._update(y)
         return y
 
     def rotateRight(self, z):
@@ -101,63 +630,142 @@ class BalancedBST:
         T3 = y.right
         y.right = z
         z.left = T3
+        self._update(z)
+        self._update(y)
         return y
 
-    def inorder(self):
-        result = []
-        def _inorder(node):
-            if node:
-                _inorder(node.left)
-                result.append(node.val)
-                _inorder(node.right)
-        _inorder(self.root)
-        return result
+    def inorder(self, distinct=False):
+        return list(self.iter_inorder(distinct=distinct))
 
-    def preorder(self):
-        result = []
-        def _preorder(node):
-            if node:
-                result.append(node.val)
-                _preorder(node.left)
-                _preorder(node.right)
-        _preorder(self.root)
-        return result
+    def preorder(self, distinct=False):
+        return list(self.iter_preorder(distinct))
 
-    def postorder(self):
-        result = []
-        def _postorder(node):
-            if node:
-                _postorder(node.left)
-                _postorder(node.right)
-                result.append(node.val)
-        _postorder(self.root)
-        return result
+    def postorder(self, distinct=False):
+        return list(self.iter_postorder(distinct))
+
+    def __iter__(self):
+        return self.iter_inorder()
 
-    def level_order(self):
+    def iter_inorder(self, start=None, distinct=False):
+        """
+        Lazily yield keys in sorted order using an explicit stack (O(height) memory).
+
+        Args:
+            start (optional): Skip keys smaller than this, e.g. to resume a scan.
+            distinct (bool): Yield each key once even if a multiset holds it several times.
+        """
+        stack = []
+        node = self.root
+        if start is not None:
+            while node:
+                if node.val >= start:
+                    stack.append(node)
+                    node = node.left
+                else:
+                    node = node.right
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.val
+            if node.count > 1 and not distinct:
+                for _ in range(node.count - 1):
+                    yield node.val
+            node = node.right
+
+    def iter_preorder(self, distinct=False):
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            yield node.val
+            if node.count > 1 and not distinct:
+                for _ in range(node.count - 1):
+                    yield node.val
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+
+    def iter_postorder(self, distinct=False):
+        stack = []
+        node = self.root
+        last_visited = None
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+                continue
+            peek = stack[-1]
+            if peek.right and last_visited is not peek.right:
+                node = peek.right
+            else:
+                yield peek.val
+                if peek.count > 1 and not distinct:
+                    for _ in range(peek.count - 1):
+                        yield peek.val
+                last_visited = stack.pop()
+
+    def level_order(self, distinct=False):
         if not self.root:
             return []
         result = []
         queue = deque([self.root])
         while queue:
             node = queue.popleft()
-            result.append(node.val)
+            result.extend([node.val] * (1 if distinct else node.count))
             if node.left:
                 queue.append(node.left)
             if node.right:
                 queue.append(node.right)
         return result
 
-    def draw(self, filename='balanced_bst'):
+    def draw(self, filename='balanced_bst', view=True):
         """
         Generate a visual PNG of the current BST using Graphviz.
 
         Args:
             filename (str): Name of the output file (default is 'balanced_bst').
+            view (bool): Open the rendered image in the system viewer.
+        """
+        dot = self.build_digraph()
+        dot.render(filename, view=view, format='png')
+        print(f"\nTree rendered and saved as '{filename}.png'")
+
+    def build_digraph(self):
+        """
+        Build the Graphviz description of the current BST without rendering it.
+
+        Returns:
+            Digraph: Graph with one node per tree node.
         """
         dot = Digraph()
         self._add_nodes_edges(self.root, dot)
-        dot.render(filename, view=True, format='png')
-        print(f"\nTree rendered and saved as '{filename}.png'")
+        return dot
+
+    def export_dot(self, path, start=None, max_depth=None, collapse_size=None):
+        """
+        Stream the tree to a DOT file without building a Digraph in memory.
+
+        Args:
+            path (str): Output file path.
+            start (optional): Export only the subtree rooted at this key.
+            max_depth (int, optional): Deepest level to draw node by node.
+            collapse_size (int, optional): Draw subtrees with more keys than this
+                as one summary node (count, min, max).
+
+        Returns:
+            int: Number of DOT nodes written.
+
+        Raises:
+            KeyError: If start is not in the tree.
+        """
+        root = self.root
+        if start is not None:
+            root = self.search(start)
+            if root is None:
+                raise KeyError(start)
+        return dotExport.export_dot(root, path, max_depth=max_depth, collapse_size=collapse_size)
 
     def _add_nodes_edges(self, node, dot, parent=None):
         """
@@ -170,7 +778,8 @@ class BalancedBST:
         """
         if node is None:
             return
-        dot.node(str(id(node)), str(node.val))
+        label = str(node.val) if node.count == 1 else f"{node.val} (x{node.count})"
+        dot.node(str(id(node)), label)
         if parent:
             dot.edge(str(id(parent)), str(id(node)))
         if node.left:
@@ -179,11 +788,14 @@ class BalancedBST:
             self._add_nodes_edges(node.right, dot, node)
 
 # ------------------ MAIN PROGRAM ------------------
-def main():
+def main(headless=False):
     """
     Interactive Balanced Binary Search Tree (AVL) visualizer and manipulator.
+
+    Rendering runs on a background thread; headless=True (or --headless) skips the image viewer.
     """
     tree = BalancedBST()
+    renderer = BackgroundRenderer(tree, "bst_tree", view=not headless)
 
     while True:
         print("\n")
@@ -201,14 +813,16 @@ def main():
 
         # QUIT
         if choice == 'q':
+            renderer.close(flush=False)
             break
 
         # INSERT
         elif choice == "i":
             try:
                 val = int(input("Enter value to insert to BST:  >>  "))
-                tree.insert(val)
-                tree.draw("bst_tree")
+                with renderer.lock:
+                    tree.insert(val)
+                renderer.request()
             except ValueError:
                 print("⚠️ Please enter a valid number.")
 
@@ -230,8 +844,9 @@ def main():
                 val = int(input("Enter value to delete.  >>  "))
                 found = tree.search(val)
                 if found:
-                    tree.remove(val)
-                    tree.draw("bst_tree")
+                    with renderer.lock:
+                        tree.remove(val)
+                    renderer.request()
                     print(f"Value {val} is deleted successfully from the tree ✅.")
                 else:
                     print(f'Value {val} is NOT FOUND in the tree ❌.')
@@ -256,7 +871,7 @@ def main():
 
         # DRAW
         elif choice == "5":
-            tree.draw("bst_tree")
+            renderer.request()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(headless="--headless" in sys.argv)
\ No newline at end of file
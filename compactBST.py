@@ -0,0 +1,308 @@
+import sys
+import random
+import tracemalloc
+from array import array
+from collections import deque
+
+NIL = -1
+
+
+class CompactBST:
+    """
+    AVL tree whose nodes are rows in parallel arrays instead of Python objects.
+
+    Row i of the tree is (keys[i], left[i], right[i], heights[i]); child links are
+    row indices and NIL (-1) marks a missing child. Rows freed by remove() are kept
+    on a free list threaded through the left array and reused by later inserts.
+    Keys must fit in a signed 64-bit integer.
+    """
+
+    def __init__(self):
+        self.keys = array('q')
+        self.left = array('q')
+        self.right = array('q')
+        self.heights = array('b')
+        self.root = NIL
+        self.free = NIL
+        self.count = 0
+
+    @classmethod
+    def from_sorted(cls, keys):
+        """
+        Build a perfectly balanced tree from keys that are already sorted, in O(n).
+
+        Args:
+            keys (iterable): Keys in ascending order; adjacent duplicates are dropped.
+
+        Returns:
+            CompactBST: New tree containing the keys.
+        """
+        unique = array('q')
+        for key in keys:
+            if not unique or key != unique[-1]:
+                unique.append(key)
+        tree = cls()
+        tree.root = tree._build(unique, 0, len(unique) - 1)
+        return tree
+
+    @classmethod
+    def from_iterable(cls, keys):
+        return cls.from_sorted(sorted(set(keys)))
+
+    def _build(self, keys, lo, hi):
+        if lo > hi:
+            return NIL
+        mid = (lo + hi) // 2
+        i = self._alloc(keys[mid])
+        self.left[i] = self._build(keys, lo, mid - 1)
+        self.right[i] = self._build(keys, mid + 1, hi)
+        self._update(i)
+        return i
+
+    def _alloc(self, key):
+        self.count += 1
+        i = self.free
+        if i == NIL:
+            self.keys.append(key)
+            self.left.append(NIL)
+            self.right.append(NIL)
+            self.heights.append(1)
+            return len(self.keys) - 1
+        self.free = self.left[i]
+        self.keys[i] = key
+        self.left[i] = NIL
+        self.right[i] = NIL
+        self.heights[i] = 1
+        return i
+
+    def _release(self, i):
+        self.count -= 1
+        self.left[i] = self.free
+        self.right[i] = NIL
+        self.free = i
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key):
+        return self.search(key)
+
+    def search(self, key):
+        """
+        Look a key up.
+
+        Args:
+            key (int): Key to find.
+
+        Returns:
+            bool: True if the key is stored in the tree.
+        """
+        keys, left, right = self.keys, self.left, self.right
+        i = self.root
+        while i != NIL:
+            k = keys[i]
+            if key == k:
+                return True
+            i = left[i] if key < k else right[i]
+        return False
+
+    def insert(self, key):
+        self.root = self._insert(self.root, key)
+
+    def _insert(self, i, key):
+        if i == NIL:
+            return self._alloc(key)
+        k = self.keys[i]
+        if key < k:
+            self.left[i] = self._insert(self.left[i], key)
+        elif key > k:
+            self.right[i] = self._insert(self.right[i], key)
+        else:
+            return i
+        return self.balance(i)
+
+    def remove(self, key):
+        self.root = self._remove(self.root, key)
+
+    def _remove(self, i, key):
+        if i == NIL:
+            return i
+        k = self.keys[i]
+        if key < k:
+            self.left[i] = self._remove(self.left[i], key)
+        elif key > k:
+            self.right[i] = self._remove(self.right[i], key)
+        else:
+            if self.left[i] == NIL or self.right[i] == NIL:
+                child = self.left[i] if self.left[i] != NIL else self.right[i]
+                self._release(i)
+                return child
+            succ = self.findMin(self.right[i])
+            self.keys[i] = self.keys[succ]
+            self.right[i] = self._remove(self.right[i], self.keys[succ])
+        return self.balance(i)
+
+    def findMin(self, i):
+        while self.left[i] != NIL:
+            i = self.left[i]
+        return i
+
+    def height(self, i):
+        if i == NIL:
+            return 0
+        return self.heights[i]
+
+    def getBalance(self, i):
+        return self.height(self.left[i]) - self.height(self.right[i])
+
+    def _update(self, i):
+        self.heights[i] = 1 + max(self.height(self.left[i]), self.height(self.right[i]))
+
+    def balance(self, i):
+        self._update(i)
+        balance_factor = self.getBalance(i)
+        if balance_factor > 1:
+            if self.getBalance(self.left[i]) < 0:
+                self.left[i] = self.rotateLeft(self.left[i])
+            return self.rotateRight(i)
+        if balance_factor < -1:
+            if self.getBalance(self.right[i]) > 0:
+                self.right[i] = self.rotateRight(self.right[i])
+            return self.rotateLeft(i)
+        return i
+
+    def rotateLeft(self, z):
+        y = self.right[z]
+        self.right[z] = self.left[y]
+        self.left[y] = z
+        self._update(z)
+        self._update(y)
+        return y
+
+    def rotateRight(self, z):
+        y = self.left[z]
+        self.left[z] = self.right[y]
+        self.right[y] = z
+        self._update(z)
+        self._update(y)
+        return y
+
+    def __iter__(self):
+        return self.iter_inorder()
+
+    def iter_inorder(self, start=None):
+        keys, left, right = self.keys, self.left, self.right
+        stack = []
+        i = self.root
+        if start is not None:
+            while i != NIL:
+                if keys[i] >= start:
+                    stack.append(i)
+                    i = left[i]
+                else:
+                    i = right[i]
+        while stack or i != NIL:
+            while i != NIL:
+                stack.append(i)
+                i = left[i]
+            i = stack.pop()
+            yield keys[i]
+            i = right[i]
+
+    def inorder(self):
+        return list(self.iter_inorder())
+
+    def preorder(self):
+        result = []
+        stack = [self.root] if self.root != NIL else []
+        while stack:
+            i = stack.pop()
+            result.append(self.keys[i])
+            if self.right[i] != NIL:
+                stack.append(self.right[i])
+            if self.left[i] != NIL:
+                stack.append(self.left[i])
+        return result
+
+    def postorder(self):
+        # reversed (root, right, left) preorder is postorder
+        result = []
+        stack = [self.root] if self.root != NIL else []
+        while stack:
+            i = stack.pop()
+            result.append(self.keys[i])
+            if self.left[i] != NIL:
+                stack.append(self.left[i])
+            if self.right[i] != NIL:
+                stack.append(self.right[i])
+        result.reverse()
+        return result
+
+    def level_order(self):
+        result = []
+        queue = deque([self.root] if self.root != NIL else [])
+        while queue:
+            i = queue.popleft()
+            result.append(self.keys[i])
+            if self.left[i] != NIL:
+                queue.append(self.left[i])
+            if self.right[i] != NIL:
+                queue.append(self.right[i])
+        return result
+
+
+def bytes_per_node(n=100000):
+    """
+    Measure the memory each storage mode spends per stored key.
+
+    Builds an n-key tree in every mode under tracemalloc and divides the traced
+    allocation by n. The keys themselves are allocated before tracing starts, so
+    the figures only cover node storage.
+
+    Args:
+        n (int): Number of keys to load.
+
+    Returns:
+        dict: Mode name -> bytes per node.
+    """
+    from binarySearchTree9 import BalancedBST
+
+    class DictNode:
+        def __init__(self, key):
+            self.left = None
+            self.right = None
+            self.val = key
+            self.height = 1
+            self.size = 1
+
+    keys = sorted(random.sample(range(1 << 40), n))
+
+    def measure(build):
+        tracemalloc.start()
+        try:
+            tree = build()
+            used = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del tree
+        return round(used / n, 1)
+
+    def dict_nodes():
+        head = None
+        for key in keys:
+            node = DictNode(key)
+            node.left = head
+            head = node
+        return head
+
+    return {
+        "dict": measure(dict_nodes),
+        "slots": measure(lambda: BalancedBST.from_sorted(keys)),
+        "compact": measure(lambda: CompactBST.from_sorted(keys)),
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for mode, size in bytes_per_node(n).items():
+        print(f"{mode:>8}: {size} bytes/node")
@@ -0,0 +1,221 @@
+import copy
+import threading
+from contextlib import contextmanager
+
+from binarySearchTree8 import VisualBST
+from persistentBST import PersistentBST
+
+
+class RWLock:
+    """
+    Readers-writer lock that lets any number of readers in at once.
+
+    Writers are preferred: once a writer is waiting, new readers queue behind it,
+    so a steady stream of searches cannot starve updates.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read_lock(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write_lock(self):
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+def clone_tree(tree):
+    """
+    Deep-copy a VisualBST or BalancedBST without recursion.
+
+    The copy shares no nodes with the original, so it can be modified while
+    other threads keep reading the original.
+    """
+    new = copy.copy(tree)
+    if hasattr(new, '_sorted_keys'):
+        new._sorted_keys = None
+    if tree.root is None:
+        return new
+    new.root = copy.copy(tree.root)
+    stack = [new.root]
+    while stack:
+        node = stack.pop()
+        if node.left is not None:
+            node.left = copy.copy(node.left)
+            stack.append(node.left)
+        if node.right is not None:
+            node.right = copy.copy(node.right)
+            stack.append(node.right)
+    return new
+
+
+class ConcurrentBST:
+    """
+    Thread-safe wrapper around a VisualBST or BalancedBST for one writer and many readers.
+
+    In the default mode every read holds the shared side of an RWLock and
+    every write holds the exclusive side. With copy_on_write=True, writers
+    instead apply their change to a private copy of the tree and publish it with
+    a single reference assignment, so readers never take a lock and never see a
+    half-applied update (e.g. remove() overwriting a node value). A BalancedBST
+    is adopted as a PersistentBST in that mode, so each write path-copies in
+    O(log n); a VisualBST has no persistent form and is cloned in O(n) per
+    write, so batch its updates with insert_many/remove_many.
+    """
+
+    def __init__(self, tree, copy_on_write=False):
+        """
+        Args:
+            tree (VisualBST | BalancedBST): Tree to guard; do not use it directly afterwards.
+            copy_on_write (bool): Publish updated copies instead of locking readers out.
+        """
+        if copy_on_write and not isinstance(tree, (VisualBST, PersistentBST)):
+            # shares the caller's nodes, which PersistentBST never modifies
+            version = PersistentBST(tree.multiset)
+            version.root = tree.root
+            tree = version
+        self._tree = tree
+        self.copy_on_write = copy_on_write
+        self._lock = RWLock()
+        self._write_mutex = threading.Lock()
+
+    # ------------------ WRITES ------------------
+    def insert(self, key):
+        self._write(lambda tree: _insert(tree, key),
+                    lambda tree: (tree.insert(key), None))
+
+    def remove(self, key):
+        return self._write(lambda tree: _remove(tree, key), _derive_remove(key))
+
+    def insert_many(self, keys):
+        keys = list(keys)
+        return self._write(lambda tree: tree.insert_many(keys),
+                           _derive_batch(lambda tree: tree.insert_many(keys)))
+
+    def remove_many(self, keys):
+        keys = list(keys)
+        return self._write(lambda tree: tree.remove_many(keys),
+                           _derive_batch(lambda tree: tree.remove_many(keys)))
+
+    def _write(self, change, derive):
+        """
+        Apply a write under the current mode.
+
+        Args:
+            change (callable): Updates a tree in place and returns the result.
+            derive (callable): Maps a PersistentBST to (new version, result).
+        """
+        if self.copy_on_write:
+            with self._write_mutex:
+                if isinstance(self._tree, PersistentBST):
+                    self._tree, result = derive(self._tree)
+                    return result
+                tree = clone_tree(self._tree)
+                result = change(tree)
+                self._tree = tree
+                return result
+        with self._lock.write_lock():
+            return change(self._tree)
+
+    # ------------------ READS ------------------
+    def contains(self, key):
+        return self._read(lambda tree: _search(tree, key) is not None)
+
+    __contains__ = contains
+
+    def contains_many(self, keys):
+        return self._read(lambda tree: tree.contains_many(keys))
+
+    def inorder(self):
+        return self._read(lambda tree: list(tree.iter_inorder()))
+
+    def __len__(self):
+        return self._read(_count)
+
+    def snapshot(self):
+        """
+        Return a tree that will not change under the caller.
+
+        In copy-on-write mode this is the currently published version (O(1));
+        otherwise a private copy is made under the read lock.
+        """
+        if self.copy_on_write:
+            return self._tree
+        with self._lock.read_lock():
+            return clone_tree(self._tree)
+
+    def _read(self, query):
+        if self.copy_on_write:
+            # a single attribute load: the version we get is never modified
+            return query(self._tree)
+        with self._lock.read_lock():
+            return query(self._tree)
+
+
+def _insert(tree, key):
+    if isinstance(tree, VisualBST):
+        tree.root = tree.insert(tree.root, key)
+    else:
+        tree.insert(key)
+
+
+def _remove(tree, key):
+    if isinstance(tree, VisualBST):
+        tree.root, removed = tree.remove(tree.root, key)
+        return removed
+    found = tree.search(key) is not None
+    tree.remove(key)
+    return found
+
+
+def _derive_remove(key):
+    def derive(tree):
+        version = tree.remove(key)
+        return version, version is not tree
+    return derive
+
+
+def _derive_batch(update):
+    # batch results are the number of keys added or removed, as in BalancedBST
+    def derive(tree):
+        version = update(tree)
+        return version, abs(len(version) - len(tree))
+    return derive
+
+
+def _search(tree, key):
+    if isinstance(tree, VisualBST):
+        return tree.searchBST(tree.root, key)
+    return tree.search(key)
+
+
+def _count(tree):
+    if hasattr(tree, '__len__'):
+        return len(tree)
+    return sum(1 for _ in tree.iter_inorder())
@@ -0,0 +1,449 @@
+import os
+import random
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+MAGIC = b'BSTDISK\x00'
+VERSION = 1
+# magic, version, page size, root page, page count, key count, free list head
+META = struct.Struct('<8sIIQQQQ')
+# page type, key count, next page (leaf chain or free list)
+PAGE_HEADER = struct.Struct('<BxHxxxxQ')
+FREE, LEAF, INTERNAL = 0, 1, 2
+NO_PAGE = 0  # page 0 is the meta page, so it never appears as a link
+# Python-side cost of one cached page beyond its key arrays: the Page object,
+# two array headers, the pool's OrderedDict entry and the arrays' growth slack
+PAGE_OVERHEAD = 1024
+
+
+class Page:
+    """
+    Decoded tree page as held in the buffer pool.
+
+    Keys and child ids stay in array('q') buffers, so a cached page costs about
+    the same number of bytes in memory as it does on disk.
+    """
+    __slots__ = ('pid', 'kind', 'keys', 'children', 'next', 'dirty')
+
+    def __init__(self, pid, kind, keys=None, children=None, next_page=NO_PAGE):
+        self.pid = pid
+        self.kind = kind
+        self.keys = keys if keys is not None else array('q')
+        self.children = children if children is not None else array('q')
+        self.next = next_page
+        self.dirty = True
+
+
+class BufferPool:
+    """
+    LRU cache of decoded pages with write-back of dirty pages.
+
+    The capacity is a page count. DiskBTree derives it from its memory budget,
+    charging each page its size plus PAGE_OVERHEAD. Pages are only evicted by trim(), which the tree calls between operations, so
+    the pages an operation is working on are never dropped underneath it. The
+    pool can therefore exceed its budget by one root-to-leaf path while an
+    operation runs.
+    """
+
+    def __init__(self, fh, page_size, capacity):
+        self.fh = fh
+        self.page_size = page_size
+        self.capacity = max(capacity, 8)
+        self.pages = OrderedDict()
+        self.reads = 0
+        self.writes = 0
+
+    def get(self, pid):
+        page = self.pages.get(pid)
+        if page is not None:
+            self.pages.move_to_end(pid)
+            return page
+        self.fh.seek(pid * self.page_size)
+        page = self._decode(pid, self.fh.read(self.page_size))
+        self.reads += 1
+        self.pages[pid] = page
+        return page
+
+    def put(self, page):
+        page.dirty = True
+        self.pages[page.pid] = page
+        self.pages.move_to_end(page.pid)
+
+    def trim(self):
+        while len(self.pages) > self.capacity:
+            _, page = self.pages.popitem(last=False)
+            if page.dirty:
+                self._write(page)
+
+    def flush(self):
+        for page in self.pages.values():
+            if page.dirty:
+                self._write(page)
+
+    def _write(self, page):
+        self.fh.seek(page.pid * self.page_size)
+        self.fh.write(self._encode(page))
+        page.dirty = False
+        self.writes += 1
+
+    def _encode(self, page):
+        body = array('q', page.keys)
+        if page.kind == INTERNAL:
+            body += page.children
+        if sys.byteorder != 'little':
+            body.byteswap()
+        data = PAGE_HEADER.pack(page.kind, len(page.keys), page.next) + body.tobytes()
+        return data.ljust(self.page_size, b'\x00')
+
+    def _decode(self, pid, data):
+        kind, count, next_page = PAGE_HEADER.unpack_from(data, 0)
+        words = 2 * count + 1 if kind == INTERNAL else count
+        body = array('q', data[PAGE_HEADER.size:PAGE_HEADER.size + 8 * words])
+        if sys.byteorder != 'little':
+            body.byteswap()
+        page = Page(pid, kind, body[:count], body[count:] if kind == INTERNAL else None, next_page)
+        page.dirty = False
+        return page
+
+
+class DiskBTree:
+    """
+    B+-tree stored in fixed-size pages of a local file.
+
+    Only the pages held by the buffer pool live in memory; everything else stays
+    on disk and is read back on demand, so the key set can be far larger than
+    RAM. Leaves are linked for sequential in-order scans. Keys are signed 64-bit
+    integers. Changes reach the file when pages are evicted, on flush() and on
+    close().
+    """
+
+    def __init__(self, path, memory_budget=64 << 20, page_size=4096):
+        """
+        Open or create a tree file.
+
+        Args:
+            path (str): Backing file.
+            memory_budget (int): Bytes of page cache to keep in memory between
+                operations, counting each cached page as page_size + PAGE_OVERHEAD.
+            page_size (int): Page size for a new file; an existing file keeps its own.
+        """
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self.path = path
+        self.fh = open(path, 'r+b' if exists else 'w+b')
+        if exists:
+            self.fh.seek(0)
+            magic, version, page_size, root, pages, count, free = META.unpack(self.fh.read(META.size))
+            if magic != MAGIC:
+                self.fh.close()
+                raise ValueError(f"{path}: not a DiskBTree file")
+            if version != VERSION:
+                self.fh.close()
+                raise ValueError(f"{path}: unsupported DiskBTree version {version}")
+        else:
+            root, pages, count, free = 1, 2, 0, NO_PAGE
+        self.page_size = page_size
+        self.leaf_capacity = (page_size - PAGE_HEADER.size) // 8
+        # an internal page stores k keys and k + 1 child ids
+        self.order = (page_size - PAGE_HEADER.size - 8) // 16 + 1
+        self.min_keys = self.leaf_capacity // 2
+        self.min_children = (self.order + 1) // 2
+        self.root = root
+        self.page_count = pages
+        self.count = count
+        self.free_head = free
+        self.pool = BufferPool(self.fh, page_size, memory_budget // (page_size + PAGE_OVERHEAD))
+        if not exists:
+            self.pool.put(Page(1, LEAF))
+            self.flush()
+
+    # ------------------ PAGE ALLOCATION ------------------
+    def _new_page(self, kind):
+        if self.free_head != NO_PAGE:
+            pid = self.free_head
+            self.free_head = self.pool.get(pid).next
+        else:
+            pid = self.page_count
+            self.page_count += 1
+        page = Page(pid, kind)
+        self.pool.put(page)
+        return page
+
+    def _touch(self, *pages):
+        for page in pages:
+            self.pool.put(page)
+
+    def _free_page(self, page):
+        page.kind = FREE
+        page.keys = array('q')
+        page.children = array('q')
+        page.next = self.free_head
+        self.free_head = page.pid
+        self.pool.put(page)
+
+    # ------------------ LOOKUPS ------------------
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key):
+        return self.search(key)
+
+    def _find_leaf(self, key):
+        page = self.pool.get(self.root)
+        while page.kind == INTERNAL:
+            page = self.pool.get(page.children[bisect_right(page.keys, key)])
+        return page
+
+    def search(self, key):
+        """
+        Look a key up.
+
+        Returns:
+            bool: True if the key is stored.
+        """
+        leaf = self._find_leaf(key)
+        i = bisect_left(leaf.keys, key)
+        found = i < len(leaf.keys) and leaf.keys[i] == key
+        self.pool.trim()
+        return found
+
+    def __iter__(self):
+        return self.iter_inorder()
+
+    def iter_inorder(self, start=None):
+        """
+        Yield keys in sorted order, reading one leaf page at a time.
+
+        Args:
+            start (int, optional): Begin at the first key >= start.
+        """
+        if start is None:
+            leaf = self.pool.get(self.root)
+            while leaf.kind == INTERNAL:
+                leaf = self.pool.get(leaf.children[0])
+            i = 0
+        else:
+            leaf = self._find_leaf(start)
+            i = bisect_left(leaf.keys, start)
+        while True:
+            keys = leaf.keys[i:]
+            next_page = leaf.next
+            self.pool.trim()
+            yield from keys
+            if next_page == NO_PAGE:
+                return
+            leaf = self.pool.get(next_page)
+            i = 0
+
+    def range(self, lo, hi):
+        """Yield the keys in [lo, hi] in ascending order."""
+        for key in self.iter_inorder(lo):
+            if key > hi:
+                return
+            yield key
+
+    def inorder(self):
+        return list(self.iter_inorder())
+
+    # ------------------ INSERT ------------------
+    def insert(self, key):
+        split = self._insert(self.pool.get(self.root), key)
+        if split is not None:
+            separator, right = split
+            root = self._new_page(INTERNAL)
+            root.keys = array('q', [separator])
+            root.children = array('q', [self.root, right.pid])
+            self.root = root.pid
+        self.pool.trim()
+
+    def _insert(self, page, key):
+        if page.kind == LEAF:
+            i = bisect_left(page.keys, key)
+            if i < len(page.keys) and page.keys[i] == key:
+                return None
+            page.keys.insert(i, key)
+            self.pool.put(page)
+            self.count += 1
+            if len(page.keys) <= self.leaf_capacity:
+                return None
+            right = self._new_page(LEAF)
+            half = len(page.keys) // 2
+            right.keys = page.keys[half:]
+            del page.keys[half:]
+            right.next = page.next
+            page.next = right.pid
+            return right.keys[0], right
+
+        i = bisect_right(page.keys, key)
+        split = self._insert(self.pool.get(page.children[i]), key)
+        if split is None:
+            return None
+        separator, child = split
+        page.keys.insert(i, separator)
+        page.children.insert(i + 1, child.pid)
+        self.pool.put(page)
+        if len(page.children) <= self.order:
+            return None
+        half = len(page.children) // 2
+        right = self._new_page(INTERNAL)
+        promoted = page.keys[half - 1]
+        right.keys = page.keys[half:]
+        right.children = page.children[half:]
+        del page.keys[half - 1:]
+        del page.children[half:]
+        return promoted, right
+
+    # ------------------ REMOVE ------------------
+    def remove(self, key):
+        root = self.pool.get(self.root)
+        self._remove(root, key)
+        if root.kind == INTERNAL and len(root.children) == 1:
+            self.root = root.children[0]
+            self._free_page(root)
+        self.pool.trim()
+
+    def _remove(self, page, key):
+        if page.kind == LEAF:
+            i = bisect_left(page.keys, key)
+            if i < len(page.keys) and page.keys[i] == key:
+                del page.keys[i]
+                self.pool.put(page)
+                self.count -= 1
+            return
+        i = bisect_right(page.keys, key)
+        child = self.pool.get(page.children[i])
+        self._remove(child, key)
+        if child.kind == LEAF:
+            if len(child.keys) < self.min_keys:
+                self._fix_leaf(page, i, child)
+        elif len(child.children) < self.min_children:
+            self._fix_internal(page, i, child)
+
+    def _siblings(self, parent, i):
+        left = self.pool.get(parent.children[i - 1]) if i > 0 else None
+        right = self.pool.get(parent.children[i + 1]) if i + 1 < len(parent.children) else None
+        return left, right
+
+    def _fix_leaf(self, parent, i, child):
+        left, right = self._siblings(parent, i)
+        if left is not None and len(left.keys) > self.min_keys:
+            child.keys.insert(0, left.keys.pop())
+            parent.keys[i - 1] = child.keys[0]
+            self._touch(left, child, parent)
+        elif right is not None and len(right.keys) > self.min_keys:
+            child.keys.append(right.keys.pop(0))
+            parent.keys[i] = right.keys[0]
+            self._touch(right, child, parent)
+        elif left is not None:
+            left.keys.extend(child.keys)
+            left.next = child.next
+            del parent.keys[i - 1]
+            del parent.children[i]
+            self._touch(left, parent)
+            self._free_page(child)
+        else:
+            child.keys.extend(right.keys)
+            child.next = right.next
+            del parent.keys[i]
+            del parent.children[i + 1]
+            self._touch(child, parent)
+            self._free_page(right)
+
+    def _fix_internal(self, parent, i, child):
+        left, right = self._siblings(parent, i)
+        if left is not None and len(left.children) > self.min_children:
+            child.keys.insert(0, parent.keys[i - 1])
+            child.children.insert(0, left.children.pop())
+            parent.keys[i - 1] = left.keys.pop()
+            self._touch(left, child, parent)
+        elif right is not None and len(right.children) > self.min_children:
+            child.keys.append(parent.keys[i])
+            child.children.append(right.children.pop(0))
+            parent.keys[i] = right.keys.pop(0)
+            self._touch(right, child, parent)
+        elif left is not None:
+            left.keys.append(parent.keys.pop(i - 1))
+            left.keys.extend(child.keys)
+            left.children.extend(child.children)
+            del parent.children[i]
+            self._touch(left, parent)
+            self._free_page(child)
+        else:
+            child.keys.append(parent.keys.pop(i))
+            child.keys.extend(right.keys)
+            child.children.extend(right.children)
+            del parent.children[i + 1]
+            self._touch(child, parent)
+            self._free_page(right)
+
+    # ------------------ DURABILITY ------------------
+    def flush(self):
+        """Write every dirty page and the meta page, then fsync the file."""
+        self.pool.flush()
+        self.fh.seek(0)
+        self.fh.write(META.pack(MAGIC, VERSION, self.page_size, self.root,
+                                self.page_count, self.count, self.free_head).ljust(self.page_size, b'\x00'))
+        self.fh.flush()
+        os.fsync(self.fh.fileno())
+
+    def close(self):
+        self.flush()
+        self.fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def self_check(operations=20000, key_range=5000, seed=1, page_size=128):
+    """
+    Run random inserts and removes against a set, reopening the file as it goes.
+
+    Small pages and an 8-page buffer pool force splits, merges, evictions and
+    free-list reuse. Every 1000 operations the tree is closed and reopened, and
+    its in-order scan, len() and a sample of lookups are compared with the set.
+
+    Returns:
+        dict: Final key count and page count of the file.
+    """
+    rng = random.Random(seed)
+    expected = set()
+    budget = 8 * (page_size + PAGE_OVERHEAD)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'check.db')
+        tree = DiskBTree(path, memory_budget=budget, page_size=page_size)
+        try:
+            for step in range(1, operations + 1):
+                key = rng.randrange(key_range)
+                if rng.random() < 0.6:
+                    tree.insert(key)
+                    expected.add(key)
+                else:
+                    tree.remove(key)
+                    expected.discard(key)
+                if step % 1000 == 0:
+                    tree.close()
+                    tree = DiskBTree(path, memory_budget=budget)
+                    if list(tree) != sorted(expected) or len(tree) != len(expected):
+                        raise AssertionError(f"contents differ from the reference set after step {step}")
+                    for probe in rng.sample(range(key_range), 100):
+                        if (probe in tree) != (probe in expected):
+                            raise AssertionError(f"lookup of {probe} disagrees after step {step}")
+            for key in sorted(expected):
+                tree.remove(key)
+            tree.close()
+            tree = DiskBTree(path, memory_budget=budget)
+            if len(tree) or list(tree):
+                raise AssertionError("tree is not empty after removing every key")
+            return {'keys': len(expected), 'pages': tree.page_count}
+        finally:
+            tree.close()
+
+
+if __name__ == "__main__":
+    print("DiskBTree reopen check passed:", self_check())
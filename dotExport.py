@@ -0,0 +1,136 @@
+import subprocess
+
+
+def write_dot(root, fh, max_depth=None, collapse_size=None, name='bst'):
+    """
+    Stream a tree to a file handle in Graphviz DOT format.
+
+    Nodes are written while the tree is walked with an explicit stack, so memory
+    stays at O(height) no matter how large the tree is. Subtrees below max_depth,
+    or holding more than collapse_size keys, are replaced by a single summary node
+    showing their key count and key range. Nodes without a cached `size` field
+    (VisualBST, RedBlackBST) get their subtree sizes from one postorder pass
+    first, which costs O(n) extra memory only when collapse_size is given.
+
+    Args:
+        root (TreeNode): Node to export; pass an inner node to export just that subtree.
+        fh (file): Text file handle to write to.
+        max_depth (int, optional): Deepest level to draw in full (the root is level 0).
+        collapse_size (int, optional): Collapse subtrees with more keys than this.
+        name (str): Name of the digraph.
+
+    Returns:
+        int: Number of DOT nodes written.
+    """
+    fh.write(f'digraph {name} {{\n')
+    fh.write('  node [shape=circle];\n')
+    written = 0
+    sizes = None
+    if collapse_size is not None and root is not None and not hasattr(root, 'size'):
+        sizes = subtree_sizes(root)
+    # stack of (node, depth, parent id)
+    stack = [(root, 0, None)] if root is not None else []
+    while stack:
+        node, depth, parent = stack.pop()
+        node_id = f'n{written}'
+        written += 1
+        depth_cut = max_depth is not None and depth > max_depth
+        size_cut = (collapse_size is not None and depth > 0
+                    and (node.size if sizes is None else sizes[id(node)]) > collapse_size)
+        if depth_cut or size_cut:
+            count, low, high = _summarize(node, sizes)
+            fh.write(f'  {node_id} [shape=box, style=dashed, '
+                     f'label="{count} keys\\n{low} .. {high}"];\n')
+        else:
+            copies = getattr(node, 'count', 1)
+            label = node.val if copies == 1 else f'{node.val} (x{copies})'
+            fh.write(f'  {node_id} [label="{label}"];\n')
+            if node.right is not None:
+                stack.append((node.right, depth + 1, node_id))
+            if node.left is not None:
+                stack.append((node.left, depth + 1, node_id))
+        if parent is not None:
+            fh.write(f'  {parent} -> {node_id};\n')
+    fh.write('}\n')
+    return written
+
+
+def subtree_sizes(root):
+    """
+    Map id(node) to the number of keys in its subtree, in one iterative postorder pass.
+
+    For trees whose nodes do not cache their subtree size. Multiset counts are included.
+    """
+    sizes = {}
+    stack = [(root, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if children_done:
+            sizes[id(node)] = (getattr(node, 'count', 1)
+                               + (sizes[id(node.left)] if node.left is not None else 0)
+                               + (sizes[id(node.right)] if node.right is not None else 0))
+            continue
+        stack.append((node, True))
+        if node.right is not None:
+            stack.append((node.right, False))
+        if node.left is not None:
+            stack.append((node.left, False))
+    return sizes
+
+
+def _summarize(node, sizes=None):
+    """
+    Return (count, min key, max key) of a subtree.
+
+    Uses the cached subtree size, or the sizes from subtree_sizes(), when there
+    is one; otherwise counts the subtree with an explicit stack.
+    """
+    low = node
+    while low.left is not None:
+        low = low.left
+    high = node
+    while high.right is not None:
+        high = high.right
+    count = sizes[id(node)] if sizes is not None else getattr(node, 'size', None)
+    if count is None:
+        count = 0
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            count += getattr(current, 'count', 1)
+            if current.left is not None:
+                stack.append(current.left)
+            if current.right is not None:
+                stack.append(current.right)
+    return count, low.val, high.val
+
+
+def export_dot(root, path, **options):
+    """
+    Write a tree to a DOT file.
+
+    Args:
+        root (TreeNode): Node to export.
+        path (str): Output file path.
+        **options: Forwarded to write_dot().
+
+    Returns:
+        int: Number of DOT nodes written.
+    """
+    with open(path, 'w', buffering=1 << 16) as fh:
+        return write_dot(root, fh, **options)
+
+
+def render_svg(dot_path, svg_path, engine='dot'):
+    """
+    Turn a DOT file into an SVG with the Graphviz command-line tool.
+
+    The file is handed to Graphviz directly, so the DOT source never has to be
+    held in memory.
+
+    Args:
+        dot_path (str): DOT file written by export_dot().
+        svg_path (str): Output SVG path.
+        engine (str): Graphviz layout program to run.
+    """
+    subprocess.run([engine, '-Tsvg', '-o', svg_path, dot_path], check=True)
@@ -0,0 +1,131 @@
+from array import array
+
+
+class FrozenBST:
+    """
+    Immutable, read-optimized copy of a BST in Eytzinger (BFS) layout.
+
+    The keys live in one contiguous array where the children of slot k are slots
+    2k and 2k+1, so a lookup is a short loop of index arithmetic instead of a
+    chain of TreeNode attribute loads, and the top levels of every search share
+    the same few cache lines. Slot 0 is unused.
+    """
+
+    def __init__(self, sorted_keys):
+        """
+        Lay out keys that are already sorted and duplicate-free.
+
+        Args:
+            sorted_keys (iterable): Keys in ascending order, e.g. tree.iter_inorder().
+        """
+        keys = list(sorted_keys)
+        n = len(keys)
+        self.n = n
+        try:
+            array('q', keys)
+            self.keys = array('q', bytes(8 * (n + 1)))
+        except (TypeError, OverflowError):
+            # keys that are not 64-bit integers fall back to a plain list
+            self.keys = [None] * (n + 1)
+        self.ranks = array('q', bytes(8 * (n + 1)))
+        self._layout(keys)
+
+    def _layout(self, keys):
+        # walk the implicit tree in order and hand out sorted keys one by one
+        n = self.n
+        keys_out, ranks = self.keys, self.ranks
+        stack = []
+        k = 1
+        i = 0
+        while stack or k <= n:
+            while k <= n:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            keys_out[k] = keys[i]
+            ranks[k] = i
+            i += 1
+            k = 2 * k + 1
+
+    def __len__(self):
+        return self.n
+
+    def __contains__(self, key):
+        return self.contains(key)
+
+    def __iter__(self):
+        n, keys = self.n, self.keys
+        stack = []
+        k = 1
+        while stack or k <= n:
+            while k <= n:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            yield keys[k]
+            k = 2 * k + 1
+
+    def _lower_bound(self, key):
+        """Slot of the smallest key >= key, or 0 if there is none."""
+        keys, n = self.keys, self.n
+        k = 1
+        while k <= n:
+            k = 2 * k + (keys[k] < key)
+        # drop the trailing right turns and the final left turn
+        return k >> (~k & (k + 1)).bit_length()
+
+    def contains(self, key):
+        """
+        Check whether a key is present.
+
+        Args:
+            key (int): Key to look up.
+
+        Returns:
+            bool: True if the key is stored.
+        """
+        # inlined _lower_bound: this is the hot path
+        keys, n = self.keys, self.n
+        k = 1
+        while k <= n:
+            k = 2 * k + (keys[k] < key)
+        k >>= (~k & (k + 1)).bit_length()
+        return k != 0 and keys[k] == key
+
+    def ceiling(self, key):
+        """Smallest key >= key, or None."""
+        k = self._lower_bound(key)
+        return self.keys[k] if k else None
+
+    def floor(self, key):
+        """Largest key <= key, or None."""
+        k = self._lower_bound(key)
+        if k and self.keys[k] == key:
+            return key
+        k = self._predecessor(k)
+        return self.keys[k] if k else None
+
+    def rank(self, key):
+        """Number of keys strictly smaller than key."""
+        k = self._lower_bound(key)
+        return self.ranks[k] if k else self.n
+
+    def _predecessor(self, k):
+        """Slot holding the key just before slot k in sorted order (k == 0 means past the end)."""
+        n = self.n
+        if k == 0:
+            if n == 0:
+                return 0
+            k = 1
+            while 2 * k + 1 <= n:
+                k = 2 * k + 1
+            return k
+        if 2 * k <= n:
+            k *= 2
+            while 2 * k + 1 <= n:
+                k = 2 * k + 1
+            return k
+        # climb while we are a left child; the parent of the last right child is next
+        while k & 1 == 0:
+            k >>= 1
+        return k >> 1
@@ -0,0 +1,237 @@
+import time
+
+# methods that take the key as their last argument and walk the tree with it
+KEYED_METHODS = ('searchBST', 'search', 'insert', 'remove')
+STRUCTURAL_METHODS = ('balance', 'rotateLeft', 'rotateRight')
+
+
+class OperationStats:
+    """Counters for one public operation (search, insert, ...)."""
+
+    def __init__(self):
+        self.count = 0
+        self.comparisons = 0
+        self.nodes_visited = 0
+        self.max_depth = 0
+        self.total_ns = 0
+        # latency histogram: bucket b counts calls that took [2**(b-1), 2**b) ns
+        self.latency_buckets = {}
+
+    def record(self, comparisons, depth, elapsed_ns):
+        self.count += 1
+        self.comparisons += comparisons
+        self.nodes_visited += depth
+        self.max_depth = max(self.max_depth, depth)
+        self.total_ns += elapsed_ns
+        bucket = elapsed_ns.bit_length()
+        self.latency_buckets[bucket] = self.latency_buckets.get(bucket, 0) + 1
+
+    def percentile(self, q):
+        """
+        Approximate latency percentile from the histogram.
+
+        Args:
+            q (float): Percentile between 0 and 100.
+
+        Returns:
+            int: Upper bound of the bucket holding the percentile, in nanoseconds.
+        """
+        if not self.count:
+            return 0
+        target = self.count * q / 100
+        seen = 0
+        for bucket in sorted(self.latency_buckets):
+            seen += self.latency_buckets[bucket]
+            if seen >= target:
+                return 1 << bucket
+        return 1 << max(self.latency_buckets)
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'comparisons': self.comparisons,
+            'nodes_visited': self.nodes_visited,
+            'avg_depth': self.nodes_visited / self.count if self.count else 0.0,
+            'max_depth': self.max_depth,
+            'avg_ns': self.total_ns / self.count if self.count else 0.0,
+            'p50_ns': self.percentile(50),
+            'p99_ns': self.percentile(99),
+        }
+
+
+class TreeStats:
+    """Aggregated counters collected while a tree is instrumented."""
+
+    def __init__(self):
+        self.operations = {}
+        self.rotations = 0
+        self.balance_calls = 0
+
+    def operation(self, name):
+        stats = self.operations.get(name)
+        if stats is None:
+            stats = self.operations[name] = OperationStats()
+        return stats
+
+    @property
+    def comparisons(self):
+        return sum(stats.comparisons for stats in self.operations.values())
+
+    @property
+    def nodes_visited(self):
+        return sum(stats.nodes_visited for stats in self.operations.values())
+
+    def reset(self):
+        self.__init__()
+
+    def as_dict(self):
+        return {
+            'rotations': self.rotations,
+            'balance_calls': self.balance_calls,
+            'comparisons': self.comparisons,
+            'nodes_visited': self.nodes_visited,
+            'operations': {name: stats.as_dict() for name, stats in self.operations.items()},
+        }
+
+
+class _Probe:
+    """
+    Stand-in for a key that counts the comparisons made against it.
+
+    Every distinct node value it is compared with is one node on the search path,
+    so len(seen) is the depth the operation reached.
+    """
+    __slots__ = ('key', 'comparisons', 'seen', 'active')
+
+    def __init__(self, key):
+        self.key = key
+        self.comparisons = 0
+        self.seen = set()
+        self.active = True
+
+    def _other(self, other):
+        if isinstance(other, _Probe):
+            other = other.key
+        if self.active:
+            self.comparisons += 1
+            self.seen.add(other)
+        return other
+
+    def __eq__(self, other):
+        return self.key == self._other(other)
+
+    def __ne__(self, other):
+        return self.key != self._other(other)
+
+    def __lt__(self, other):
+        return self.key < self._other(other)
+
+    def __le__(self, other):
+        return self.key <= self._other(other)
+
+    def __gt__(self, other):
+        return self.key > self._other(other)
+
+    def __ge__(self, other):
+        return self.key >= self._other(other)
+
+    def __hash__(self):
+        return hash(self.key)
+
+
+def _unwrap(node, probe):
+    """Replace a probe that insert() stored in a node with the raw key."""
+    probe.active = False
+    key = probe.key
+    while node is not None:
+        if node.val is probe:
+            node.val = key
+            return
+        node = node.left if key < node.val else node.right
+
+
+def enable(tree, stats=None, on_operation=None, on_rotation=None):
+    """
+    Swap instrumented versions of the hot-path methods onto one tree instance.
+
+    The class itself is never modified, so trees that are not instrumented run
+    the original code with no extra cost. Works with VisualBST (searchBST,
+    insert, remove) and BalancedBST (search, insert, remove, balance,
+    rotateLeft, rotateRight). On a PersistentBST only the instrumented version
+    records stats; the versions its updates return are not instrumented.
+
+    Args:
+        tree (VisualBST | BalancedBST): Tree to instrument.
+        stats (TreeStats, optional): Collector to fill; a new one is created if omitted.
+        on_operation (callable, optional): Called as on_operation(name, key, comparisons,
+            depth, elapsed_ns) after every keyed operation.
+        on_rotation (callable, optional): Called as on_rotation(name) after every rotation.
+
+    Returns:
+        TreeStats: The collector attached to the tree.
+    """
+    disable(tree)
+    stats = stats if stats is not None else TreeStats()
+    tree._instrumentation = stats
+    for name in KEYED_METHODS:
+        original = getattr(tree, name, None)
+        if original is not None:
+            setattr(tree, name, _keyed(tree, name, original, stats, on_operation))
+    for name in STRUCTURAL_METHODS:
+        original = getattr(tree, name, None)
+        if original is not None:
+            setattr(tree, name, _structural(name, original, stats, on_rotation))
+    return stats
+
+
+def disable(tree):
+    """
+    Remove instrumentation from a tree and return its collector (or None).
+    """
+    for name in KEYED_METHODS + STRUCTURAL_METHODS:
+        tree.__dict__.pop(name, None)
+    return tree.__dict__.pop('_instrumentation', None)
+
+
+def stats_for(tree):
+    """Return the collector attached by enable(), or None."""
+    return tree.__dict__.get('_instrumentation')
+
+
+def _keyed(tree, name, original, stats, on_operation):
+    clock = time.perf_counter_ns
+
+    def instrumented(*args):
+        probe = _Probe(args[-1])
+        start = clock()
+        result = original(*args[:-1], probe)
+        elapsed = clock() - start
+        if name == 'insert':
+            # VisualBST.insert returns the new root, PersistentBST.insert a new
+            # version, and BalancedBST.insert updates tree.root
+            root = result if result is not None else tree.root
+            _unwrap(getattr(root, 'root', root), probe)
+        probe.active = False
+        depth = len(probe.seen)
+        stats.operation(name).record(probe.comparisons, depth, elapsed)
+        if on_operation is not None:
+            on_operation(name, probe.key, probe.comparisons, depth, elapsed)
+        return result
+
+    instrumented.__wrapped__ = original
+    return instrumented
+
+
+def _structural(name, original, stats, on_rotation):
+    if name == 'balance':
+        def instrumented(node):
+            stats.balance_calls += 1
+            return original(node)
+    else:
+        def instrumented(node):
+            stats.rotations += 1
+            if on_rotation is not None:
+                on_rotation(name)
+            return original(node)
+    instrumented.__wrapped__ = original
+    return instrumented
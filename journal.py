@@ -0,0 +1,243 @@
+import os
+import random
+import struct
+import tempfile
+import time
+import zlib
+
+from binarySearchTree8 import VisualBST
+
+OP_INSERT = 1
+OP_REMOVE = 2
+# op code, key, crc32 of the first two fields
+RECORD = struct.Struct('<BqI')
+BODY = struct.Struct('<Bq')
+
+SNAPSHOT_NAME = 'snapshot.bin'
+JOURNAL_NAME = 'journal.log'
+
+
+class Journal:
+    """
+    Append-only log of insert/remove records.
+
+    Each record is 13 bytes: op code, int64 key and a CRC32 of both. Records are
+    buffered and fsync'ed as a group once `sync_every` records are pending or
+    `sync_interval` seconds have passed since the last sync, whichever comes first.
+    """
+
+    def __init__(self, path, sync_every=64, sync_interval=0.05):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.pending = 0
+        self.records = 0
+        self._last_sync = time.monotonic()
+        self._fh = open(path, 'ab', buffering=1 << 16)
+
+    def append(self, op, key):
+        body = BODY.pack(op, key)
+        self._fh.write(body + struct.pack('<I', zlib.crc32(body)))
+        self.pending += 1
+        self.records += 1
+        if (self.pending >= self.sync_every
+                or time.monotonic() - self._last_sync >= self.sync_interval):
+            self.sync()
+
+    def sync(self):
+        """Flush buffered records and fsync them to disk."""
+        if self.pending:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self.pending = 0
+        self._last_sync = time.monotonic()
+
+    def truncate(self):
+        """Drop every record, e.g. after they were folded into a snapshot."""
+        self._fh.flush()
+        self._fh.truncate(0)
+        os.fsync(self._fh.fileno())
+        self.pending = 0
+        self.records = 0
+
+    def close(self):
+        self.sync()
+        self._fh.close()
+
+
+def replay(path, apply):
+    """
+    Feed every intact record of a journal file to apply(op, key).
+
+    Replay stops at the first short or corrupt record, which is what a crash in
+    the middle of an append leaves behind.
+
+    Args:
+        path (str): Journal file; a missing file counts as empty.
+        apply (callable): Called with (op, key) for each record in order.
+
+    Returns:
+        tuple: (records replayed, byte offset just past the last good record)
+    """
+    if not os.path.exists(path):
+        return 0, 0
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    count = 0
+    for offset in range(0, len(data) - RECORD.size + 1, RECORD.size):
+        op, key, crc = RECORD.unpack_from(data, offset)
+        if crc != zlib.crc32(data[offset:offset + BODY.size]) or op not in (OP_INSERT, OP_REMOVE):
+            break
+        apply(op, key)
+        count += 1
+    return count, count * RECORD.size
+
+
+class JournaledTree:
+    """
+    Durable wrapper around a VisualBST or BalancedBST.
+
+    Every insert/remove is appended to the journal before it is applied to the
+    tree. checkpoint() writes a snapshot of the tree and empties the journal, so
+    recovery only replays the records written since the last checkpoint.
+
+    Replaying is idempotent for a set (insert of a present key and remove of a
+    missing key are no-ops), so a crash between writing the snapshot and
+    truncating the journal still recovers the right contents.
+    """
+
+    def __init__(self, directory, tree_cls, sync_every=64, sync_interval=0.05, checkpoint_every=None):
+        """
+        Open (or create) a journaled tree and recover its state.
+
+        Args:
+            directory (str): Folder holding snapshot.bin and journal.log.
+            tree_cls (type): VisualBST or BalancedBST.
+            sync_every (int): Records per group commit; 1 fsyncs every operation.
+            sync_interval (float): Longest time in seconds a record may stay unsynced
+                while further operations arrive.
+            checkpoint_every (int, optional): Checkpoint automatically after this many records.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.tree_cls = tree_cls
+        self.checkpoint_every = checkpoint_every
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_NAME)
+        self.journal_path = os.path.join(directory, JOURNAL_NAME)
+        self.replayed = 0
+        self.tree = self._recover()
+        self.journal = Journal(self.journal_path, sync_every, sync_interval)
+        self.journal.records = self.replayed
+
+    def _recover(self):
+        if os.path.exists(self.snapshot_path):
+            tree = self.tree_cls.load(self.snapshot_path)
+        else:
+            tree = self.tree_cls()
+        self.replayed, good = replay(self.journal_path, lambda op, key: self._apply(tree, op, key))
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) != good:
+            # cut off the torn tail so new records follow the last good one
+            with open(self.journal_path, 'r+b') as fh:
+                fh.truncate(good)
+        return tree
+
+    def _apply(self, tree, op, key):
+        if isinstance(tree, VisualBST):
+            if op == OP_INSERT:
+                tree.root = tree.insert(tree.root, key)
+            else:
+                tree.root, _ = tree.remove(tree.root, key)
+        elif op == OP_INSERT:
+            tree.insert(key)
+        else:
+            tree.remove(key)
+
+    def insert(self, key):
+        self.journal.append(OP_INSERT, key)
+        self._apply(self.tree, OP_INSERT, key)
+        self._maybe_checkpoint()
+
+    def remove(self, key):
+        self.journal.append(OP_REMOVE, key)
+        self._apply(self.tree, OP_REMOVE, key)
+        self._maybe_checkpoint()
+
+    def search(self, key):
+        if isinstance(self.tree, VisualBST):
+            return self.tree.searchBST(self.tree.root, key)
+        return self.tree.search(key)
+
+    def _maybe_checkpoint(self):
+        if self.checkpoint_every and self.journal.records >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Fold the journal into a fresh snapshot and empty it."""
+        self.journal.sync()
+        self.tree.save(self.snapshot_path)
+        self.journal.truncate()
+
+    def sync(self):
+        self.journal.sync()
+
+    def close(self):
+        self.journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def self_check(rounds=50, operations=200, key_range=500, seed=1):
+    """
+    Crash-recovery check: recover from a torn journal tail over and over.
+
+    Each round applies random operations (with the odd checkpoint), closes the
+    tree and then appends a torn record, either cut short or with a bad CRC,
+    as a crash mid-append would. The reopened tree must hold exactly the
+    operations before the torn record, and the records written after recovery
+    must survive the next reopen. Runs for both VisualBST and BalancedBST.
+
+    Returns:
+        int: Number of recoveries checked.
+    """
+    from binarySearchTree9 import BalancedBST
+
+    rng = random.Random(seed)
+    recoveries = 0
+    for tree_cls in (VisualBST, BalancedBST):
+        expected = set()
+        with tempfile.TemporaryDirectory() as directory:
+            for round_no in range(rounds):
+                with JournaledTree(directory, tree_cls, sync_every=8) as tree:
+                    if list(tree.tree.iter_inorder()) != sorted(expected):
+                        raise AssertionError(f"{tree_cls.__name__}: wrong contents after recovery {round_no}")
+                    for _ in range(operations):
+                        key = rng.randrange(key_range)
+                        if rng.random() < 0.6:
+                            tree.insert(key)
+                            expected.add(key)
+                        else:
+                            tree.remove(key)
+                            expected.discard(key)
+                        if rng.random() < 0.005:
+                            tree.checkpoint()
+                body = BODY.pack(OP_INSERT, key_range + round_no)
+                record = body + struct.pack('<I', zlib.crc32(body))
+                if rng.random() < 0.5:
+                    torn = record[:rng.randrange(1, RECORD.size)]
+                else:
+                    torn = record[:-1] + bytes([record[-1] ^ 0xFF])
+                with open(os.path.join(directory, JOURNAL_NAME), 'ab') as fh:
+                    fh.write(torn)
+                recoveries += 1
+            with JournaledTree(directory, tree_cls) as tree:
+                if list(tree.tree.iter_inorder()) != sorted(expected):
+                    raise AssertionError(f"{tree_cls.__name__}: wrong contents after the last recovery")
+    return recoveries
+
+
+if __name__ == "__main__":
+    print("journal recovered from", self_check(), "torn tails")
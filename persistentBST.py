@@ -0,0 +1,230 @@
+import copy
+import heapq
+import random
+
+import sortedMerge
+import snapshot
+from binarySearchTree9 import BalancedBST, TreeNode
+
+
+class PersistentBST(BalancedBST):
+    """
+    Immutable AVL tree where every update returns a new version.
+
+    insert() and remove() copy only the nodes on the root-to-key path (plus the
+    O(1) nodes a rotation moves), so an update costs O(log n) time and memory
+    and all untouched subtrees are shared between versions. Older versions stay
+    valid and keep every read method of BalancedBST: search, rank, select,
+    traversals, iteration, freeze, save, draw and so on.
+
+    Treat versions as read-only: the inherited in-place helpers that rewrite
+    self.root are not part of this class's contract.
+    """
+
+    def insert(self, key):
+        """
+        Return a new version that also contains key.
+
+        Returns:
+            PersistentBST: The new version, or self if key was already present
+                (a multiset always returns a new version with the count raised).
+        """
+        if not self.multiset and self.search(key) is not None:
+            return self
+        return self._version(self._insert(self.root, key))
+
+    def remove(self, key):
+        """
+        Return a new version without key.
+
+        Returns:
+            PersistentBST: The new version, or self if key was not present.
+        """
+        if self.search(key) is None:
+            return self
+        return self._version(self._remove(self.root, key))
+
+    def insert_many(self, keys):
+        """
+        Return a new version with a whole batch inserted.
+
+        Small batches are applied with path copying; large ones are merged with
+        the in-order keys and built into a fresh balanced tree.
+        """
+        batch = sorted(keys) if self.multiset else sorted(set(keys))
+        n = len(self)
+        if len(batch) * (n.bit_length() + 1) < n:
+            version = self
+            for key in batch:
+                version = version.insert(key)
+            return version
+        if self.multiset:
+            return self.from_sorted(heapq.merge(self.iter_inorder(), batch), multiset=True)
+        return self.from_sorted(sortedMerge.union(self.iter_inorder(), batch))
+
+    def remove_many(self, keys):
+        """Return a new version with a whole batch removed (one occurrence per key in a multiset)."""
+        batch = sorted(keys) if self.multiset else sorted(set(keys))
+        n = len(self)
+        if len(batch) * (n.bit_length() + 1) < n:
+            version = self
+            for key in batch:
+                version = version.remove(key)
+            return version
+        return self.from_sorted(sortedMerge.difference(self.iter_inorder(), batch), self.multiset)
+
+    # Versions never change, so the in-place set updates return the result instead.
+
+    def update(self, other):
+        """Return a new version with the keys of other added; same as union(other)."""
+        return self.union(other) if self.multiset else self.insert_many(other)
+
+    def difference_update(self, other):
+        """Return a new version with the keys of other removed; same as difference(other)."""
+        return self.difference(other) if self.multiset else self.remove_many(other)
+
+    def intersection_update(self, other):
+        """Return a new version with only the keys also in other (same as intersection)."""
+        return self.intersection(other)
+
+    def symmetric_difference_update(self, other):
+        """Return a new version with the keys found in exactly one of the two (same as symmetric_difference)."""
+        return self.symmetric_difference(other)
+
+    def remove_range(self, lo, hi):
+        """
+        Return a new version without the keys in [lo, hi], in O(log n).
+
+        The difference in len() between the two versions is the number of keys removed.
+
+        Returns:
+            PersistentBST: The new version, or self if no key was in range.
+        """
+        if hi < lo:
+            return self
+        left, rest = self._split(self.root, lo)
+        middle, right = self._split(rest, hi, inclusive=True)
+        if middle is None:
+            return self
+        return self._version(self._join2(left, right))
+
+    def split(self, key):
+        """
+        Return (left, right) versions holding the keys < key and >= key.
+
+        Only the O(log n) nodes along the split path are copied; self is unchanged.
+        """
+        left, right = self._split(self.root, key)
+        return self._version(left), self._version(right)
+
+    @classmethod
+    def join(cls, left, right):
+        """Return a new version concatenating left and right; both inputs stay valid."""
+        tree = cls(left.multiset or right.multiset)
+        tree.root = tree._join_trees(left, right)
+        return tree
+
+    def _reusable_nodes(self):
+        # every node may be shared with another version, so rebuilds never relink them
+        return iter(())
+
+    def _version(self, root):
+        version = self.__class__(self.multiset)
+        version.root = root
+        return version
+
+    # The base AVL code mutates the nodes it is handed. Each override below gives
+    # it a private copy first, which turns in-place updates into path copying.
+
+    def _insert(self, node, key):
+        if node is None:
+            return TreeNode(key)
+        return super()._insert(copy.copy(node), key)
+
+    def _remove(self, node, key):
+        if node is None:
+            return node
+        return super()._remove(copy.copy(node), key)
+
+    def _join3(self, left, mid, right):
+        return super()._join3(copy.copy(left), copy.copy(mid), copy.copy(right))
+
+    def _pop_min(self, node):
+        return super()._pop_min(copy.copy(node))
+
+    def rotateLeft(self, z):
+        # the right child may be a shared subtree (e.g. the sibling during a delete)
+        z = copy.copy(z)
+        z.right = copy.copy(z.right)
+        return super().rotateLeft(z)
+
+    def rotateRight(self, z):
+        z = copy.copy(z)
+        z.left = copy.copy(z.left)
+        return super().rotateRight(z)
+
+
+def _fingerprint(version):
+    # identity and every field of every node, so any in-place change shows up
+    return [(id(node), node.val, node.count, node.height, node.size, id(node.left), id(node.right))
+            for node in snapshot.inorder_nodes(version.root)]
+
+
+def _check_avl(version):
+    for node in snapshot.postorder_nodes(version.root):
+        left, right = version.height(node.left), version.height(node.right)
+        if abs(left - right) > 1 or node.height != 1 + max(left, right):
+            raise AssertionError(f"AVL balance or height broken at {node.val}")
+        if node.size != node.count + version.size(node.left) + version.size(node.right):
+            raise AssertionError(f"subtree size broken at {node.val}")
+
+
+def self_check(operations=3000, key_range=1000, seed=1):
+    """
+    Apply random updates, some branched off old versions, and verify that no version changes.
+
+    Every version ever produced keeps its contents and a fingerprint of its
+    nodes (identity and fields); after each update a sample of old versions is
+    re-checked against both, and the new version's AVL heights and sizes are
+    verified. Single inserts are also checked to allocate only O(log n) nodes.
+
+    Returns:
+        dict: Versions checked and the most nodes a single insert allocated.
+    """
+    rng = random.Random(seed)
+    history = [(PersistentBST(), [], [])]
+    most_new_nodes = 0
+    for step in range(operations):
+        # mostly extend the newest version so the tree grows; sometimes branch off an old one
+        base, _, _ = history[-1] if rng.random() < 0.8 else rng.choice(history)
+        key = rng.randrange(key_range)
+        choice = rng.random()
+        if choice < 0.45:
+            version = base.insert(key)
+            shared = {id(node) for node in snapshot.inorder_nodes(base.root)}
+            new_nodes = sum(id(node) not in shared for node in snapshot.inorder_nodes(version.root))
+            most_new_nodes = max(most_new_nodes, new_nodes)
+            if new_nodes > 2 * base.height(base.root) + 3:
+                raise AssertionError(f"insert allocated {new_nodes} nodes into {len(base)} keys")
+        elif choice < 0.8:
+            version = base.remove(key)
+        elif choice < 0.9:
+            version = base.remove_range(key, key + rng.randrange(50))
+        elif choice < 0.95:
+            version = base.insert_many(rng.randrange(key_range) for _ in range(rng.randrange(1, 40)))
+        else:
+            left, right = base.split(key)
+            version = PersistentBST.join(left, right)
+        _check_avl(version)
+        history.append((version, list(version), _fingerprint(version)))
+        for old, keys, fingerprint in rng.sample(history, min(len(history), 20)):
+            if list(old) != keys or _fingerprint(old) != fingerprint:
+                raise AssertionError(f"an old version changed at step {step}")
+    for old, keys, fingerprint in history:
+        if list(old) != keys or _fingerprint(old) != fingerprint:
+            raise AssertionError("an old version changed")
+    return {'versions': len(history), 'most_nodes_per_insert': most_new_nodes}
+
+
+if __name__ == "__main__":
+    print("old PersistentBST versions unchanged:", self_check())
@@ -0,0 +1,525 @@
+import random
+import sys
+from collections import deque
+from graphviz import Digraph
+
+import dotExport
+from treeRenderer import BackgroundRenderer
+
+
+class RBNode:
+    __slots__ = ('val', 'left', 'right', 'parent', 'red')
+
+    def __init__(self, key):
+        self.val = key
+        self.left = None
+        self.right = None
+        self.parent = None
+        self.red = True
+
+
+class RedBlackBST:
+    """
+    Red-black tree with the same public API as BalancedBST.
+
+    It keeps looser balance than AVL (height <= 2*log2(n+1)) in exchange for
+    fewer rotations: at most 2 per insert and 3 per remove, with all other
+    fix-up work done by recoloring. Missing children are None.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def search(self, key):
+        node = self.root
+        while node is not None:
+            if key == node.val:
+                return node
+            node = node.left if key < node.val else node.right
+        return None
+
+    def findMin(self, node):
+        current = node
+        while current.left is not None:
+            current = current.left
+        return current
+
+    def insert(self, key):
+        parent = None
+        node = self.root
+        while node is not None:
+            parent = node
+            if key < node.val:
+                node = node.left
+            elif key > node.val:
+                node = node.right
+            else:
+                return
+        new = RBNode(key)
+        new.parent = parent
+        if parent is None:
+            self.root = new
+        elif key < parent.val:
+            parent.left = new
+        else:
+            parent.right = new
+        self.count += 1
+        self._insert_fixup(new)
+
+    def _insert_fixup(self, z):
+        while z.parent is not None and z.parent.red:
+            parent = z.parent
+            grand = parent.parent
+            if parent is grand.left:
+                uncle = grand.right
+                if uncle is not None and uncle.red:
+                    parent.red = uncle.red = False
+                    grand.red = True
+                    z = grand
+                    continue
+                if z is parent.right:
+                    z = parent
+                    self.rotateLeft(z)
+                    parent = z.parent
+                parent.red = False
+                grand.red = True
+                self.rotateRight(grand)
+            else:
+                uncle = grand.left
+                if uncle is not None and uncle.red:
+                    parent.red = uncle.red = False
+                    grand.red = True
+                    z = grand
+                    continue
+                if z is parent.left:
+                    z = parent
+                    self.rotateRight(z)
+                    parent = z.parent
+                parent.red = False
+                grand.red = True
+                self.rotateLeft(grand)
+        self.root.red = False
+
+    def remove(self, key):
+        z = self.search(key)
+        if z is None:
+            return
+        self.count -= 1
+        removed_red = z.red
+        if z.left is None:
+            x, x_parent = z.right, z.parent
+            self._transplant(z, z.right)
+        elif z.right is None:
+            x, x_parent = z.left, z.parent
+            self._transplant(z, z.left)
+        else:
+            # splice out the in-order successor and move it into z's place
+            y = self.findMin(z.right)
+            removed_red = y.red
+            x = y.right
+            if y.parent is z:
+                x_parent = y
+            else:
+                x_parent = y.parent
+                self._transplant(y, y.right)
+                y.right = z.right
+                y.right.parent = y
+            self._transplant(z, y)
+            y.left = z.left
+            y.left.parent = y
+            y.red = z.red
+        if not removed_red:
+            self._remove_fixup(x, x_parent)
+
+    def _remove_fixup(self, x, parent):
+        # x carries an extra black; None counts as black
+        while x is not self.root and (x is None or not x.red):
+            if x is parent.left:
+                sibling = parent.right
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self.rotateLeft(parent)
+                    sibling = parent.right
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.red = True
+                    x, parent = parent, parent.parent
+                    continue
+                if not _is_red(sibling.right):
+                    sibling.left.red = False
+                    sibling.red = True
+                    self.rotateRight(sibling)
+                    sibling = parent.right
+                sibling.red = parent.red
+                parent.red = False
+                sibling.right.red = False
+                self.rotateLeft(parent)
+                x = self.root
+            else:
+                sibling = parent.left
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self.rotateRight(parent)
+                    sibling = parent.left
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.red = True
+                    x, parent = parent, parent.parent
+                    continue
+                if not _is_red(sibling.left):
+                    sibling.right.red = False
+                    sibling.red = True
+                    self.rotateLeft(sibling)
+                    sibling = parent.left
+                sibling.red = parent.red
+                parent.red = False
+                sibling.left.red = False
+                self.rotateRight(parent)
+                x = self.root
+        if x is not None:
+            x.red = False
+
+    def _transplant(self, old, new):
+        if old.parent is None:
+            self.root = new
+        elif old is old.parent.left:
+            old.parent.left = new
+        else:
+            old.parent.right = new
+        if new is not None:
+            new.parent = old.parent
+
+    def rotateLeft(self, x):
+        y = x.right
+        x.right = y.left
+        if y.left is not None:
+            y.left.parent = x
+        self._transplant(x, y)
+        y.left = x
+        x.parent = y
+        return y
+
+    def rotateRight(self, x):
+        y = x.left
+        x.left = y.right
+        if y.right is not None:
+            y.right.parent = x
+        self._transplant(x, y)
+        y.right = x
+        x.parent = y
+        return y
+
+    def inorder(self):
+        return list(self.iter_inorder())
+
+    def preorder(self):
+        return list(self.iter_preorder())
+
+    def postorder(self):
+        return list(self.iter_postorder())
+
+    def __iter__(self):
+        return self.iter_inorder()
+
+    def iter_inorder(self, start=None):
+        stack = []
+        node = self.root
+        if start is not None:
+            while node:
+                if node.val >= start:
+                    stack.append(node)
+                    node = node.left
+                else:
+                    node = node.right
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.val
+            node = node.right
+
+    def iter_preorder(self):
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            yield node.val
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+
+    def iter_postorder(self):
+        stack = []
+        node = self.root
+        last_visited = None
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+                continue
+            peek = stack[-1]
+            if peek.right and last_visited is not peek.right:
+                node = peek.right
+            else:
+                yield peek.val
+                last_visited = stack.pop()
+
+    def level_order(self):
+        if not self.root:
+            return []
+        result = []
+        queue = deque([self.root])
+        while queue:
+            node = queue.popleft()
+            result.append(node.val)
+            if node.left:
+                queue.append(node.left)
+            if node.right:
+                queue.append(node.right)
+        return result
+
+    def draw(self, filename='red_black_bst', view=True):
+        """
+        Generate a visual PNG of the current tree using Graphviz, with red and black nodes.
+
+        Args:
+            filename (str): Name of the output file (default is 'red_black_bst').
+            view (bool): Open the rendered image in the system viewer.
+        """
+        dot = self.build_digraph()
+        dot.render(filename, view=view, format='png')
+        print(f"\nTree rendered and saved as '{filename}.png'")
+
+    def build_digraph(self):
+        """
+        Build the Graphviz description of the tree without rendering it.
+
+        Returns:
+            Digraph: Graph with filled red/black nodes.
+        """
+        dot = Digraph()
+        dot.attr('node', style='filled', fontcolor='white')
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            dot.node(str(id(node)), str(node.val), fillcolor='red' if node.red else 'black')
+            if node.parent:
+                dot.edge(str(id(node.parent)), str(id(node)))
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+        return dot
+
+    def export_dot(self, path, start=None, max_depth=None, collapse_size=None):
+        """
+        Stream the tree to a DOT file without building a Digraph (see dotExport.py).
+
+        max_depth and collapse_size summarize deep or large subtrees as in BalancedBST.export_dot().
+
+        Raises:
+            KeyError: If start is not in the tree.
+        """
+        root = self.root
+        if start is not None:
+            root = self.search(start)
+            if root is None:
+                raise KeyError(start)
+        return dotExport.export_dot(root, path, max_depth=max_depth, collapse_size=collapse_size)
+
+
+def _is_red(node):
+    return node is not None and node.red
+
+
+def check_invariants(tree):
+    """
+    Verify the red-black and BST invariants of a tree.
+
+    Checks that the root is black, that no red node has a red child, that every
+    root-to-leaf path has the same number of black nodes, that parent links and
+    key order are consistent and that len() matches the node count.
+
+    Returns:
+        int: Black height of the tree.
+
+    Raises:
+        AssertionError: If an invariant is broken.
+    """
+    if _is_red(tree.root):
+        raise AssertionError("root is red")
+    if tree.root is not None and tree.root.parent is not None:
+        raise AssertionError("root has a parent")
+    nodes = 0
+    previous = None
+    black_height = None
+    # stack of (node, black nodes above it, visited)
+    stack = [(tree.root, 0, False)] if tree.root is not None else []
+    while stack:
+        node, blacks, visited = stack.pop()
+        if visited:
+            if previous is not None and not previous < node.val:
+                raise AssertionError(f"keys out of order at {node.val}")
+            previous = node.val
+            nodes += 1
+            continue
+        blacks += not node.red
+        for child in (node.left, node.right):
+            if child is None:
+                if black_height is None:
+                    black_height = blacks
+                elif blacks != black_height:
+                    raise AssertionError(f"black height differs below {node.val}")
+                continue
+            if child.parent is not node:
+                raise AssertionError(f"bad parent link at {child.val}")
+            if node.red and child.red:
+                raise AssertionError(f"red node {node.val} has a red child")
+        if node.right is not None:
+            stack.append((node.right, blacks, False))
+        stack.append((node, blacks, True))
+        if node.left is not None:
+            stack.append((node.left, blacks, False))
+    if nodes != len(tree):
+        raise AssertionError(f"len() is {len(tree)} but the tree holds {nodes} nodes")
+    return black_height or 0
+
+
+def self_check(operations=40000, key_range=2000, seed=1):
+    """
+    Run random inserts and removes against a set and check the invariants as it goes.
+
+    Rotations are counted per operation to confirm the fix-up bounds (at most
+    2 per insert and 3 per remove).
+
+    Returns:
+        dict: Largest rotation count seen per insert and per remove.
+    """
+    rng = random.Random(seed)
+    tree = RedBlackBST()
+    expected = set()
+    rotations = [0]
+    for name in ('rotateLeft', 'rotateRight'):
+        original = getattr(tree, name)
+
+        def counted(x, original=original):
+            rotations[0] += 1
+            return original(x)
+        setattr(tree, name, counted)
+    worst = {'insert': 0, 'remove': 0}
+    for step in range(operations):
+        key = rng.randrange(key_range)
+        rotations[0] = 0
+        if rng.random() < 0.55:
+            tree.insert(key)
+            expected.add(key)
+            worst['insert'] = max(worst['insert'], rotations[0])
+        else:
+            tree.remove(key)
+            expected.discard(key)
+            worst['remove'] = max(worst['remove'], rotations[0])
+        if step % 100 == 0 or step == operations - 1:
+            check_invariants(tree)
+            if list(tree) != sorted(expected):
+                raise AssertionError(f"contents differ from the reference set after step {step}")
+    if worst['insert'] > 2 or worst['remove'] > 3:
+        raise AssertionError(f"too many rotations: {worst}")
+    return worst
+
+
+# ------------------ MAIN PROGRAM ------------------
+def main(headless=False):
+    """
+    Interactive red-black tree visualizer and manipulator.
+
+    Rendering runs on a background thread; headless=True (or --headless) skips the image viewer.
+    """
+    tree = RedBlackBST()
+    renderer = BackgroundRenderer(tree, "bst_tree", view=not headless)
+
+    while True:
+        print("\n")
+        print("[q] Quit.")
+        print("[i] Insert a value.")
+        print("[s] Search for a value.")
+        print("[r] Remove a value.")
+        print("1: Print values in INORDER TRAVERSAL.")
+        print("2: Print values in PREORDER TRAVERSAL.")
+        print("3: Print values in POSTORDER TRAVERSAL.")
+        print("4: Print values in LEVEL ORDER TRAVERSAL.")
+        print("5: Visualize the tree (Graphviz).")
+        print(">>> CHOOSE AN OPTION <<<")
+        choice = input(">>  ").lower()
+
+        # QUIT
+        if choice == 'q':
+            renderer.close(flush=False)
+            break
+
+        # INSERT
+        elif choice == "i":
+            try:
+                val = int(input("Enter value to insert to BST:  >>  "))
+                with renderer.lock:
+                    tree.insert(val)
+                renderer.request()
+            except ValueError:
+                print("⚠️ Please enter a valid number.")
+
+        # SEARCH
+        elif choice == "s":
+            try:
+                val = int(input("Enter value to search:  >>  "))
+                result = tree.search(val)
+                if result:
+                    print(f'Value {val} is FOUND in the tree.')
+                else:
+                    print(f'Value {val} is NOT FOUND in the tree.')
+            except ValueError:
+                print("⚠️ Please enter a valid number.")
+
+        # REMOVE
+        elif choice == "r":
+            try:
+                val = int(input("Enter value to delete.  >>  "))
+                found = tree.search(val)
+                if found:
+                    with renderer.lock:
+                        tree.remove(val)
+                    renderer.request()
+                    print(f"Value {val} is deleted successfully from the tree ✅.")
+                else:
+                    print(f'Value {val} is NOT FOUND in the tree ❌.')
+            except ValueError:
+                print("⚠️ Please enter a valid number.")
+
+        # INORDER
+        elif choice == "1":
+            print("INORDER:", tree.inorder())
+
+        # PREORDER
+        elif choice == "2":
+            print("PREORDER:", tree.preorder())
+
+        # POSTORDER
+        elif choice == "3":
+            print("POSTORDER:", tree.postorder())
+
+        # LEVEL ORDER
+        elif choice == "4":
+            print("LEVEL ORDER:", tree.level_order())
+
+        # DRAW
+        elif choice == "5":
+            renderer.request()
+
+if __name__ == "__main__":
+    if "--check" in sys.argv:
+        print("red-black invariants hold; max rotations:", self_check())
+    else:
+        main(headless="--headless" in sys.argv)
@@ -0,0 +1,247 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+MAGIC = b'BSTSNAP\x00'
+VERSION = 1
+FLAG_SHAPE = 1
+FLAG_MULTISET = 2  # keys repeat once per copy held by a multiset tree
+# magic, version, flags, reserved, key count, reserved
+HEADER = struct.Struct('<8sHHIQQ')
+CHUNK = 1 << 16
+
+
+class SnapshotView:
+    """
+    Read-only, memory-mapped view of a snapshot file.
+
+    The sorted keys (and the optional preorder shape) are exposed as int64
+    memoryviews straight over the mapped file, so opening a snapshot costs O(1)
+    and lookups are binary searches over the mapping. Nothing is copied until a
+    key is actually read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path}: not a BST snapshot (file too short)")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, _, count, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a BST snapshot")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: unsupported snapshot version {version}")
+        sections = 2 if flags & FLAG_SHAPE else 1
+        if size < HEADER.size + sections * count * 8:
+            self.close()
+            raise ValueError(f"{path}: truncated snapshot")
+        self.version = version
+        self.has_shape = bool(flags & FLAG_SHAPE)
+        self.multiset = bool(flags & FLAG_MULTISET)
+        self.count = count
+        self._map_sections()
+
+    def _map_sections(self):
+        view = memoryview(self._map)
+        start = HEADER.size
+        end = start + self.count * 8
+        self.keys = _int64_view(view[start:end])
+        self.preorder = _int64_view(view[end:end + self.count * 8]) if self.has_shape else None
+        view.release()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __contains__(self, key):
+        return self.search(key)
+
+    def search(self, key):
+        """
+        Binary-search the mapped keys.
+
+        Args:
+            key (int): Key to look up.
+
+        Returns:
+            bool: True if the snapshot contains the key.
+        """
+        i = bisect_left(self.keys, key)
+        return i < self.count and self.keys[i] == key
+
+    def close(self):
+        """
+        Unmap the snapshot and close the file.
+
+        The file is always closed. If the caller still holds a slice of keys or
+        preorder, BufferError is raised and the view stays readable; release
+        the slice and call close() again to unmap it.
+        """
+        try:
+            for section in (getattr(self, 'keys', None), getattr(self, 'preorder', None)):
+                if isinstance(section, memoryview):
+                    section.release()
+            self.keys = self.preorder = None
+            if getattr(self, '_map', None) is not None:
+                try:
+                    self._map.close()
+                except BufferError:
+                    # still mapped: hand back the views released above
+                    self._map_sections()
+                    raise
+                self._map = None
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _int64_view(raw):
+    """Zero-copy int64 view of a little-endian section; big-endian hosts get a swapped copy."""
+    if sys.byteorder == 'little':
+        return raw.cast('q')
+    keys = array('q', raw.tobytes())
+    keys.byteswap()
+    raw.release()
+    return keys
+
+
+def open_snapshot(path):
+    """Map a snapshot file for read-only lookups without building any TreeNode."""
+    return SnapshotView(path)
+
+
+def write_snapshot(path, sorted_keys, preorder=None, multiset=False):
+    """
+    Write a versioned binary snapshot.
+
+    The file is a fixed header followed by the keys in ascending order as
+    little-endian int64, and, when preorder is given, the same keys in preorder
+    so the exact tree shape can be rebuilt. Both sequences are streamed in
+    chunks, so they may be generators. The file is written under a temporary
+    name and renamed into place; on failure the temporary file is removed.
+
+    Args:
+        path (str): Destination file.
+        sorted_keys (iterable): Keys in ascending order.
+        preorder (iterable, optional): The same keys in preorder.
+        multiset (bool): Mark the file as a multiset, whose sorted keys repeat.
+
+    Returns:
+        int: Number of keys written.
+    """
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, 'wb') as fh:
+            fh.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0, 0))
+            count = _write_keys(fh, sorted_keys)
+            flags = FLAG_MULTISET if multiset else 0
+            if preorder is not None:
+                if _write_keys(fh, preorder) != count:
+                    raise ValueError("preorder and sorted keys differ in length")
+                flags |= FLAG_SHAPE
+            fh.seek(0)
+            fh.write(HEADER.pack(MAGIC, VERSION, flags, 0, count, 0))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        # never leave a partial snapshot behind
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    return count
+
+
+def _write_keys(fh, keys):
+    count = 0
+    chunk = array('q')
+    for key in keys:
+        chunk.append(key)
+        if len(chunk) == CHUNK:
+            _dump(fh, chunk)
+            count += len(chunk)
+            chunk = array('q')
+    _dump(fh, chunk)
+    return count + len(chunk)
+
+
+def _dump(fh, chunk):
+    if sys.byteorder != 'little':
+        chunk.byteswap()
+    fh.write(chunk.tobytes())
+
+
+def build_from_preorder(keys, make_node):
+    """
+    Rebuild the exact BST whose preorder sequence is `keys`, in O(n).
+
+    Args:
+        keys (iterable): Keys in preorder.
+        make_node (callable): Creates a node from a key (e.g. TreeNode).
+
+    Returns:
+        TreeNode: Root of the rebuilt tree, or None if keys is empty.
+    """
+    root = None
+    stack = []
+    for key in keys:
+        node = make_node(key)
+        if root is None:
+            root = node
+        elif key < stack[-1].val:
+            stack[-1].left = node
+        else:
+            parent = stack.pop()
+            while stack and stack[-1].val < key:
+                parent = stack.pop()
+            parent.right = node
+        stack.append(node)
+    return root
+
+
+def postorder_nodes(root):
+    """Yield the nodes of a tree in postorder using an explicit stack."""
+    stack = []
+    node = root
+    last_visited = None
+    while stack or node:
+        if node:
+            stack.append(node)
+            node = node.left
+            continue
+        peek = stack[-1]
+        if peek.right and last_visited is not peek.right:
+            node = peek.right
+        else:
+            yield peek
+            last_visited = stack.pop()
+
+
+def inorder_nodes(root):
+    """Yield the nodes of a tree in order using an explicit stack."""
+    stack = []
+    node = root
+    while stack or node:
+        while node:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
@@ -0,0 +1,110 @@
+"""
+Linear merges over ascending, duplicate-free key streams.
+
+Every function takes two sorted iterables (for example tree.iter_inorder() and
+a sorted batch) and lazily yields the merged keys in ascending order, touching
+each input key once. An input that goes backwards raises ValueError instead of
+producing an unsorted stream.
+"""
+
+_END = object()
+
+
+def as_sorted(keys):
+    """Return a tree's in-order iterator, or a sorted copy of any other iterable (e.g. a set)."""
+    if hasattr(keys, 'iter_inorder'):
+        return keys.iter_inorder()
+    return sorted(keys)
+
+
+def _ascending(keys):
+    keys = iter(keys)
+    last = next(keys, _END)
+    if last is _END:
+        return
+    yield last
+    for key in keys:
+        if key < last:
+            raise ValueError(f"merge input is not ascending: {key!r} after {last!r}")
+        yield key
+        last = key
+
+
+def union(a, b):
+    a, b = _ascending(a), _ascending(b)
+    x, y = next(a, _END), next(b, _END)
+    while x is not _END and y is not _END:
+        if x < y:
+            yield x
+            x = next(a, _END)
+        elif y < x:
+            yield y
+            y = next(b, _END)
+        else:
+            yield x
+            x, y = next(a, _END), next(b, _END)
+    while x is not _END:
+        yield x
+        x = next(a, _END)
+    while y is not _END:
+        yield y
+        y = next(b, _END)
+
+
+def intersection(a, b):
+    a, b = _ascending(a), _ascending(b)
+    x, y = next(a, _END), next(b, _END)
+    while x is not _END and y is not _END:
+        if x < y:
+            x = next(a, _END)
+        elif y < x:
+            y = next(b, _END)
+        else:
+            yield x
+            x, y = next(a, _END), next(b, _END)
+
+
+def difference(a, b):
+    # also a multiset difference: each repeated key of b cancels one equal key of a
+    a, b = _ascending(a), _ascending(b)
+    x, y = next(a, _END), next(b, _END)
+    while x is not _END and y is not _END:
+        if x < y:
+            yield x
+            x = next(a, _END)
+        elif y < x:
+            y = next(b, _END)
+        else:
+            x, y = next(a, _END), next(b, _END)
+    while x is not _END:
+        yield x
+        x = next(a, _END)
+
+
+def symmetric_difference(a, b):
+    a, b = _ascending(a), _ascending(b)
+    x, y = next(a, _END), next(b, _END)
+    while x is not _END and y is not _END:
+        if x < y:
+            yield x
+            x = next(a, _END)
+        elif y < x:
+            yield y
+            y = next(b, _END)
+        else:
+            x, y = next(a, _END), next(b, _END)
+    while x is not _END:
+        yield x
+        x = next(a, _END)
+    while y is not _END:
+        yield y
+        y = next(b, _END)
+
+
+def distinct(a):
+    """Drop adjacent duplicates, e.g. to feed a multiset tree's iteration into the merges above."""
+    last = _END
+    for x in a:
+        if last is _END or x != last:
+            yield x
+            last = x
@@ -0,0 +1,98 @@
+import threading
+import time
+
+from graphviz import ExecutableNotFound
+
+
+class BackgroundRenderer:
+    """
+    Render a tree with Graphviz on a background thread.
+
+    The interactive CLI calls request() after every edit instead of draw(). The
+    worker waits until no new request has arrived for `delay` seconds, so a burst
+    of edits produces a single render, and it drops a frame whenever the tree
+    changed again before `dot` was started.
+
+    The tree is only read while holding `lock`; callers must hold the same lock
+    while they modify the tree.
+    """
+
+    def __init__(self, tree, filename='bst_tree', delay=0.2, view=True):
+        """
+        Start the render worker.
+
+        Args:
+            tree (VisualBST | BalancedBST): Tree to render; must provide build_digraph().
+            filename (str): Name of the output file, without extension.
+            delay (float): Quiet period in seconds before a render starts.
+            view (bool): Open each frame in the system viewer; False renders headless.
+        """
+        self.tree = tree
+        self.filename = filename
+        self.delay = delay
+        self.view = view
+        self.lock = threading.Lock()
+        self.frames = 0
+        self._cond = threading.Condition()
+        self._requested = 0
+        self._rendered = 0
+        self._last_request = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='bst-renderer', daemon=True)
+        self._thread.start()
+
+    def request(self):
+        """Mark the tree as changed; returns immediately."""
+        with self._cond:
+            self._requested += 1
+            self._last_request = time.monotonic()
+            self._cond.notify()
+
+    def close(self, flush=True, timeout=None):
+        """
+        Stop the worker.
+
+        Args:
+            flush (bool): Render the latest pending change before stopping.
+            timeout (float, optional): Seconds to wait for the worker to exit.
+        """
+        with self._cond:
+            if not flush:
+                self._rendered = self._requested
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._rendered == self._requested and not self._closed:
+                    self._cond.wait()
+                if self._rendered == self._requested:
+                    return
+                # coalesce the burst: wait until the edits stop coming in
+                while not self._closed:
+                    remaining = self._last_request + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                generation = self._requested
+
+            with self.lock:
+                dot = self.tree.build_digraph()
+
+            with self._cond:
+                stale = generation != self._requested and not self._closed
+            if stale:
+                continue
+
+            try:
+                dot.render(self.filename, view=self.view, format='png')
+                self.frames += 1
+            except ExecutableNotFound:
+                print("\n⚠️ Graphviz 'dot' executable not found; tree was not rendered.")
+            except Exception as exc:
+                print(f"\n⚠️ Rendering failed: {exc}")
+
+            with self._cond:
+                self._rendered = max(self._rendered, generation)